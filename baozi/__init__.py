@@ -1,4 +1,20 @@
-from . import error, frozen, typecast
+from . import (
+    collection,
+    error,
+    frozen,
+    memo,
+    order,
+    patch,
+    persistent,
+    pool,
+    schema,
+    snapshot,
+    stream,
+    table,
+    twin,
+    typecast,
+    view,
+)
 from .baozi import MISSING as MISSING
 from .baozi import ArgumentError as ArgumentError
 from .baozi import ConfigBase as ConfigBase
@@ -9,9 +25,38 @@ from .baozi import pretty_repr as pretty_repr
 from .baozi import field as field
 from .baozi import read_attributes as read_attributes
 from .baozi import read_slots as read_slots
+from .collection import IndexedCollection as IndexedCollection
+from .collection import Range as Range
+from .error import FieldNotFoundError as FieldNotFoundError
 from .error import InvalidTypeError as InvalidTypeError
+from .error import MutableArgumentError as MutableArgumentError
 from .error import MutableFieldError as MutableFieldError
+from .error import UnsupportedFieldTypeError as UnsupportedFieldTypeError
 from .frozen import is_field_immutable as is_field_immutable
+from .frozen import register_immutable as register_immutable
+from .memo import memoize as memoize
+from .order import make_sort_key as make_sort_key
+from .order import sort_structs as sort_structs
+from .patch import Patch as Patch
+from .patch import apply_patch as apply_patch
+from .patch import diff as diff
+from .persistent import PMap as PMap
+from .persistent import PVector as PVector
+from .pool import StructPool as StructPool
+from .schema import FieldInfo as FieldInfo
+from .schema import StructSchema as StructSchema
+from .schema import get_schema as get_schema
+from .schema import schema_fingerprint as schema_fingerprint
+from .snapshot import load_config as load_config
+from .stream import iter_csv as iter_csv
+from .stream import iter_ndjson as iter_ndjson
+from .table import StructTable as StructTable
+from .table import write_table as write_table
+from .twin import freeze as freeze
+from .twin import thaw as thaw
 from .typecast import TypeCoerceError as TypeCoerceError
 from .typecast import ValueNotFoundError as ValueNotFoundError
+from .typecast import make_decoder as make_decoder
 from .typecast import parse_config as parse_config
+from .view import StructView as StructView
+from .view import as_mapping as as_mapping
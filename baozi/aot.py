@@ -0,0 +1,203 @@
+"""
+ahead-of-time compilation of generated struct methods.
+
+dataclasses builds `__init__`, `__repr__`, `__eq__`... of every struct by
+generating source text and compiling it at import time, so does baozi for
+its own generated methods. with aot enabled, the compiled code objects are
+stored next to the module bytecode, in `__pycache__/<module>.<tag>.baozi`,
+and later imports load them instead of compiling again.
+
+entries are keyed by a hash of the generated source,
+a cache file is dropped as a whole when the module source changes.
+
+precompile modules:
+
+    python -m baozi.aot myapp.models myapp.events
+
+load the cache at process start, before models are imported:
+
+    import baozi.aot
+    baozi.aot.enable()
+"""
+
+import argparse
+import atexit
+import dataclasses
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import marshal
+import os
+import sys
+import typing as ty
+from types import CodeType
+
+from .codegen import create_fn, set_code_cache
+
+CACHE_SUFFIX = ".baozi"
+_FORMAT_VERSION = 1
+_DATACLASS_CREATE_FN = getattr(dataclasses, "_create_fn", None)
+
+
+def cache_path(source_path: str) -> str:
+    "__pycache__/models.cpython-311.pyc -> __pycache__/models.cpython-311.baozi"
+    pyc_path = importlib.util.cache_from_source(source_path)
+    return os.path.splitext(pyc_path)[0] + CACHE_SUFFIX
+
+
+def _source_hash(source_path: str) -> str:
+    with open(source_path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+class _ModuleCodes:
+    __slots__ = ("path", "source_hash", "codes", "dirty")
+
+    def __init__(self, path: str, source_hash: str, codes: dict[str, CodeType]):
+        self.path = path
+        self.source_hash = source_hash
+        self.codes = codes
+        self.dirty = False
+
+
+class ModuleCodeCache:
+    "code objects of generated methods, grouped by the module defining the struct"
+
+    def __init__(self):
+        self._modules: dict[str, _ModuleCodes | None] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self, module: str) -> _ModuleCodes | None:
+        source_path = getattr(sys.modules.get(module), "__file__", None)
+        if not source_path or not source_path.endswith(".py"):
+            return None
+
+        try:
+            source_hash = _source_hash(source_path)
+        except OSError:
+            return None
+
+        path = cache_path(source_path)
+        try:
+            with open(path, "rb") as file:
+                data = marshal.load(file)
+        except (OSError, EOFError, ValueError, TypeError):
+            return _ModuleCodes(path, source_hash, {})
+
+        if (
+            isinstance(data, dict)
+            and data.get("version") == _FORMAT_VERSION
+            and data.get("source") == source_hash
+        ):
+            return _ModuleCodes(path, source_hash, data["codes"])
+        return _ModuleCodes(path, source_hash, {})
+
+    def get_code(self, source: str, module: str | None) -> CodeType:
+        if module is None:
+            return compile(source, "<string>", "exec")
+
+        try:
+            entry = self._modules[module]
+        except KeyError:
+            entry = self._modules[module] = self._load(module)
+
+        if entry is None:
+            return compile(source, "<string>", "exec")
+
+        key = hashlib.sha1(source.encode()).hexdigest()
+        if (code := entry.codes.get(key)) is not None:
+            self.hits += 1
+            return code
+
+        self.misses += 1
+        code = entry.codes[key] = compile(source, "<string>", "exec")
+        entry.dirty = True
+        return code
+
+    def dump(self) -> list[str]:
+        "write caches of modules with newly compiled code, return written paths"
+        written = []
+        for entry in self._modules.values():
+            if entry is None or not entry.dirty:
+                continue
+
+            data = dict(
+                version=_FORMAT_VERSION, source=entry.source_hash, codes=entry.codes
+            )
+            tmp_path = f"{entry.path}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(entry.path), exist_ok=True)
+                with open(tmp_path, "wb") as file:
+                    marshal.dump(data, file)
+                os.replace(tmp_path, entry.path)
+            except OSError:
+                continue
+
+            entry.dirty = False
+            written.append(entry.path)
+        return written
+
+
+_cache: ModuleCodeCache | None = None
+
+
+def _patchable_dataclasses() -> bool:
+    if _DATACLASS_CREATE_FN is None:
+        return False
+    params = inspect.signature(_DATACLASS_CREATE_FN).parameters
+    return list(params) == list(inspect.signature(create_fn).parameters)
+
+
+def enable(write: bool = True) -> ModuleCodeCache:
+    """
+    load cached code for structs defined from now on,
+    newly compiled code is written back at exit if `write` is True
+    """
+    global _cache
+    if _cache is not None:
+        return _cache
+
+    _cache = ModuleCodeCache()
+    # dataclasses is patched only while struct classes are processed
+    set_code_cache(_cache, patch_dataclasses=_patchable_dataclasses())
+
+    if write and not sys.dont_write_bytecode:
+        atexit.register(_cache.dump)
+    return _cache
+
+
+def disable() -> None:
+    global _cache
+    if _cache is None:
+        return
+
+    atexit.unregister(_cache.dump)
+    set_code_cache(None)
+    _cache = None
+
+
+def compile_modules(modules: ty.Iterable[str]) -> list[str]:
+    "import modules with aot enabled and write their caches"
+    cache = enable(write=False)
+    for module in modules:
+        importlib.import_module(module)
+    return cache.dump()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m baozi.aot",
+        description="precompile generated methods of structs defined in modules",
+    )
+    parser.add_argument("modules", nargs="+", help="dotted module names")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.getcwd())
+    for path in compile_modules(args.modules):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,20 @@ import sys
 import typing as ty
 from dataclasses import MISSING as MISSING
 from dataclasses import _process_class as _process_class  # type: ignore
-from dataclasses import asdict, is_dataclass
+from dataclasses import is_dataclass
 from dataclasses import field as field
 from types import MethodType as MethodType
 
+from .codegen import struct_codegen
 from .error import ArgumentError, InvalidTypeError, MutableFieldError
-from .frozen import is_class_immutable
+from .frozen import is_class_immutable, register_immutable
+from .order import ORDER_KEY_ATTR, install_cached_order, make_sort_key
+from .schema import build_schema, get_schema, set_schema
 from .slots import create_slots_struct
+from .snapshot import load_config
 from .typecast import parse_config
+from .twin import make_twin
+from .view import as_mapping
 
 DATACLASS_DEFAULT_KW = dict(
     init=True,
@@ -31,7 +37,15 @@ FIELDS_DEFAULT_KW = dict(
 )
 
 
+# baozi-only configs, not passed to dataclasses
+STRUCT_DEFAULT_KW = dict(
+    cache_order=False,
+    twin=False,
+)
+
+
 FIELDS_PARAMS = "__BAOZI_FIELD_PARAMS__"
+STRUCT_PARAMS = "__BAOZI_STRUCT_PARAMS__"
 
 
 class SlotProtocol(ty.Protocol):
@@ -83,6 +97,7 @@ def get_dc_params(dataclass):
     return params
 
 
+@register_immutable
 class MetaConfig(ty.TypedDict):
     init: ty.NotRequired[bool]  # = True
     repr: ty.NotRequired[bool]  # = True
@@ -94,9 +109,8 @@ class MetaConfig(ty.TypedDict):
     kw_only: ty.NotRequired[bool]  # = False
     slots: ty.NotRequired[bool]  # = False
     flyweight: ty.NotRequired[bool]  # = False
-
-
-BAOZI_META_TYPE: tuple[type] = (MetaConfig,)
+    cache_order: ty.NotRequired[bool]  # = False
+    twin: ty.NotRequired[bool]  # = False
 
 
 @ty.dataclass_transform(kw_only_default=True)
@@ -123,10 +137,12 @@ class StructMeta(type):
 
         base_m_params = dict()
         base_f_params = dict()
+        base_s_params = dict()
         for base in bases:
             if is_dataclass(base):
                 base_m_params.update(get_dc_params(base))
                 base_f_params.update(getattr(base, FIELDS_PARAMS, {}))
+                base_s_params.update(getattr(base, STRUCT_PARAMS, {}))
 
         meat_config = namespace.get("__meta_config__", {})
 
@@ -136,6 +152,11 @@ class StructMeta(type):
         current_f_config = {
             k: v for k, v in m_configs.items() if k in FIELDS_DEFAULT_KW
         }
+        current_s_config = {
+            k: v
+            for k, v in (m_configs | meat_config).items()
+            if k in STRUCT_DEFAULT_KW
+        }
 
         model_config = (
             DATACLASS_DEFAULT_KW | base_m_params | current_m_config | meat_config
@@ -147,25 +168,48 @@ class StructMeta(type):
         if field_params := getattr(raw_cls, FIELDS_PARAMS, {}):
             field_config |= field_params
 
+        struct_config = STRUCT_DEFAULT_KW | base_s_params | current_s_config
+
         setattr(raw_cls, FIELDS_PARAMS, field_config)
-        cls_config = model_config | field_config
+        setattr(raw_cls, STRUCT_PARAMS, struct_config)
+        cls_config = {
+            k: v
+            for k, v in (model_config | field_config).items()
+            if k not in STRUCT_DEFAULT_KW
+        }
 
         # configs are all set
 
         if "__repr__" in namespace:
             cls_config["repr"] = False
 
+        if struct_config["cache_order"]:
+            if not (cls_config["order"] and cls_config["frozen"]):
+                raise TypeError("cache_order requires both order=True and frozen=True")
+
         if cls_config["slots"]:
-            cls_ = create_slots_struct(raw_cls, cls_config)
+            extra_slots = (ORDER_KEY_ATTR,) if struct_config["cache_order"] else ()
+            cls_ = create_slots_struct(raw_cls, cls_config, extra_slots)
         else:
-            cls_ = _process_class(raw_cls, **cls_config)
+            with struct_codegen():
+                cls_ = _process_class(raw_cls, **cls_config)
+            set_schema(cls_, build_schema(cls_, frozen=cls_config["frozen"]))
+
+        schema = get_schema(cls_)
 
-        # TODO: extract imtypes from cls_config
         if cls_config["frozen"]:
             try:
-                is_class_immutable(cls_, imtypes=BAOZI_META_TYPE)
+                is_class_immutable(cls_)
             except InvalidTypeError as it:
                 raise MutableFieldError(it.attr_name, it.type_) from it
+            set_schema(cls_, schema._replace(immutable=True))
+
+        if struct_config["cache_order"]:
+            install_cached_order(cls_, schema)
+
+        if struct_config["twin"]:
+            twin_base = Struct if cls_config["frozen"] else FrozenStruct
+            make_twin(cls_, twin_base, order=cls_config["order"])
 
         pre_init: ty.Callable | None = getattr(cls_, "__pre_init__", None)
 
@@ -191,6 +235,13 @@ class StructMeta(type):
         meta_cls.__call__ = new_call  # type: ignore
         return cls_
 
+    def sort_key(cls, *names: str) -> ty.Callable[[ty.Any], ty.Any]:
+        """
+        key function reading the given fields, `sorted(users, key=User.sort_key('age'))`.
+        a field named `sort_key` hides this method, use `baozi.make_sort_key(User, ...)`
+        """
+        return make_sort_key(cls, *names)
+
 
 class Struct(metaclass=StructMeta):
     __meta_config__: ty.ClassVar[MetaConfig] = MetaConfig(kw_only=True)
@@ -204,7 +255,8 @@ class FrozenStruct(metaclass=StructMeta):
     )
 
     def but(self, **kw_attrs):
-        data = asdict(self)
+        # fields are passed as is, persistent fields share their nodes
+        data = {name: getattr(self, name) for name in get_schema(self).field_names}
         updated = data | kw_attrs
         return self.__class__(**updated)
 
@@ -214,5 +266,12 @@ class ConfigBase(FrozenStruct):  # type: ignore
         return pretty_repr(self)
 
     @classmethod
-    def parse(cls, config: ty.Mapping[str, ty.Any]):
-        return cls(**parse_config(cls, config))
+    def parse(cls, config: ty.Mapping[str, ty.Any] | Struct | FrozenStruct):
+        if get_schema(type(config)) is not None:
+            config = as_mapping(config)
+        return cls(**parse_config(cls, config))  # type: ignore
+
+    @classmethod
+    def load(cls, source, *, loader=None, snapshot=None):
+        "parse a config file through an on-disk snapshot, see `baozi.snapshot`"
+        return load_config(cls, source, loader=loader, snapshot=snapshot)
@@ -0,0 +1,94 @@
+import dataclasses
+import sys
+import typing as ty
+from contextlib import contextmanager
+from dataclasses import MISSING
+from types import CodeType
+
+
+class CodeCache(ty.Protocol):
+    def get_code(self, source: str, module: str | None) -> CodeType:
+        ...
+
+
+_code_cache: CodeCache | None = None
+_patch_dataclasses: bool = False
+
+
+def set_code_cache(cache: CodeCache | None, patch_dataclasses: bool = False) -> None:
+    """
+    route generated code through cache, with `patch_dataclasses`
+    methods generated by dataclasses for structs are routed too, see `struct_codegen`
+    """
+    global _code_cache, _patch_dataclasses
+    _code_cache = cache
+    _patch_dataclasses = cache is not None and patch_dataclasses
+
+
+@contextmanager
+def struct_codegen() -> ty.Iterator[None]:
+    """
+    while processing a struct class, let dataclasses generate methods through
+    `create_fn`, other dataclasses of the process are left untouched.
+    """
+    if not _patch_dataclasses:
+        yield
+        return
+
+    saved = dataclasses._create_fn  # type: ignore
+    dataclasses._create_fn = create_fn  # type: ignore
+    try:
+        yield
+    finally:
+        dataclasses._create_fn = saved  # type: ignore
+
+
+def compile_source(source: str, module: str | None = None) -> CodeType:
+    if _code_cache is None or module is None:
+        return compile(source, "<string>", "exec")
+    return _code_cache.get_code(source, module)
+
+
+def module_globals(cls: type) -> dict:
+    if (module := sys.modules.get(cls.__module__)) is not None:
+        return module.__dict__
+    return {}
+
+
+def create_fn(
+    name: str,
+    args: ty.Iterable[str],
+    body: ty.Iterable[str],
+    *,
+    globals: dict | None = None,
+    locals: dict | None = None,
+    return_type: ty.Any = MISSING,
+) -> ty.Callable:
+    """
+    build a function from source lines, same approach and signature as
+    dataclasses._create_fn: names in `locals` are bound as closure variables
+    of the generated function.
+    """
+    if locals is None:
+        locals = {}
+    return_annotation = ""
+    if return_type is not MISSING:
+        locals["_return_type"] = return_type
+        return_annotation = "->_return_type"
+    args_txt = ",".join(args)
+    body_txt = "\n".join(f"  {line}" for line in body)
+
+    txt = f" def {name}({args_txt}){return_annotation}:\n{body_txt}"
+    local_vars = ", ".join(locals.keys())
+    txt = f"def __create_fn__({local_vars}):\n{txt}\n return {name}"
+
+    module = globals.get("__name__") if globals else None
+    ns: dict = {}
+    exec(compile_source(txt, module), globals, ns)
+    return ns["__create_fn__"](**locals)
+
+
+def set_qualname(cls: type, fn: ty.Callable) -> ty.Callable:
+    fn.__module__ = cls.__module__
+    fn.__qualname__ = f"{cls.__qualname__}.{fn.__name__}"
+    return fn
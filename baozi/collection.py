@@ -0,0 +1,289 @@
+import types
+import typing as ty
+from bisect import bisect_left, bisect_right
+
+from .error import FieldNotFoundError, InvalidTypeError
+from .frozen import is_field_immutable
+from .schema import StructSchema, resolve_schema
+
+T = ty.TypeVar("T")
+
+
+class Range(ty.NamedTuple):
+    "condition matching low <= value < high, None means unbounded"
+
+    low: ty.Any = None
+    high: ty.Any = None
+    include_low: bool = True
+    include_high: bool = False
+
+
+def _check_fields(
+    struct_type: type, schema: StructSchema, names: ty.Iterable[str]
+) -> tuple[str, ...]:
+    names = tuple(names)
+    for name in names:
+        if name not in schema.offsets:
+            raise FieldNotFoundError(name, struct_type)
+    return names
+
+
+class _SortedIndex:
+    "field values kept sorted, with ids of records in a parallel list"
+
+    __slots__ = ("values", "ids")
+
+    def __init__(self):
+        self.values: list = []
+        self.ids: list[int] = []
+
+    def position(self, value) -> int:
+        "insert position of value, raises TypeError if it can not be ordered"
+        return bisect_right(self.values, value)
+
+    def insert(self, pos: int, value, rid: int) -> None:
+        self.values.insert(pos, value)
+        self.ids.insert(pos, rid)
+
+    def add(self, value, rid: int) -> None:
+        self.insert(self.position(value), value, rid)
+
+    def remove(self, value, rid: int) -> None:
+        lo = bisect_left(self.values, value)
+        hi = bisect_right(self.values, value, lo)
+        pos = self.ids.index(rid, lo, hi)
+        del self.values[pos]
+        del self.ids[pos]
+
+    def select(self, cond: Range) -> list[int]:
+        values = self.values
+        if cond.low is None:
+            lo = 0
+        elif cond.include_low:
+            lo = bisect_left(values, cond.low)
+        else:
+            lo = bisect_right(values, cond.low)
+
+        if cond.high is None:
+            hi = len(values)
+        elif cond.include_high:
+            hi = bisect_right(values, cond.high, lo)
+        else:
+            hi = bisect_left(values, cond.high, lo)
+        return self.ids[lo:hi]
+
+    def equal(self, value) -> list[int]:
+        lo = bisect_left(self.values, value)
+        return self.ids[lo : bisect_right(self.values, value, lo)]
+
+
+def _is_nullable(field_type) -> bool:
+    if field_type is None or field_type is type(None) or field_type is ty.Any:
+        return True
+    if ty.get_origin(field_type) in (ty.Union, types.UnionType):
+        return type(None) in ty.get_args(field_type)
+    return False
+
+
+def _match(value, cond) -> bool:
+    if not isinstance(cond, Range):
+        return value == cond
+    if value is None:
+        return False
+    try:
+        if cond.low is not None:
+            if value < cond.low or (not cond.include_low and value == cond.low):
+                return False
+        if cond.high is not None:
+            if value > cond.high or (not cond.include_high and value == cond.high):
+                return False
+    except TypeError:
+        # values that can not be compared with the bounds are out of range
+        return False
+    return True
+
+
+class IndexedCollection(ty.Generic[T]):
+    """
+    in-memory collection of frozen structs with indexes on chosen fields.
+
+    hash indexes serve equality conditions,
+    sorted indexes serve both equality and `Range` conditions.
+
+    people = IndexedCollection(Person, hash_index=["name"], sorted_index=["age"])
+    people.find(name="baozi", age=Range(18, 30))
+    """
+
+    def __init__(
+        self,
+        struct_type: type[T],
+        hash_index: ty.Iterable[str] = (),
+        sorted_index: ty.Iterable[str] = (),
+        records: ty.Iterable[T] = (),
+    ):
+        schema = resolve_schema(struct_type)
+        if schema is None or not schema.immutable:
+            # records must not change while being indexed
+            raise TypeError(
+                f"{struct_type.__name__} is not a frozen struct class, "
+                "only immutable records can be indexed"
+            )
+
+        hash_fields = _check_fields(struct_type, schema, hash_index)
+        sorted_fields = _check_fields(struct_type, schema, sorted_index)
+        for name in hash_fields + sorted_fields:
+            if not is_field_immutable(schema.types[name]):
+                raise InvalidTypeError(name, schema.types[name])
+        for name in sorted_fields:
+            if _is_nullable(schema.types[name]):
+                raise TypeError(
+                    f"{struct_type.__name__}.{name} may be None, "
+                    "which can not be ordered in a sorted index"
+                )
+
+        self._struct_type = struct_type
+        self._schema = schema
+        self._records: dict[int, T] = {}
+        self._hash_indexes: dict[str, dict[ty.Any, dict[int, T]]] = {
+            name: {} for name in hash_fields
+        }
+        self._sorted_indexes: dict[str, _SortedIndex] = {
+            name: _SortedIndex() for name in sorted_fields
+        }
+
+        for record in records:
+            self.add(record)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> ty.Iterator[T]:
+        return iter(self._records.values())
+
+    def __contains__(self, record) -> bool:
+        return id(record) in self._records
+
+    def add(self, record: T) -> None:
+        if not isinstance(record, self._struct_type):
+            raise TypeError(f"{record!r} is not an instance of {self._struct_type}")
+
+        rid = id(record)
+        if rid in self._records:
+            return
+
+        # every index is checked before any of them is touched
+        keys = [
+            (index, getattr(record, name)) for name, index in self._hash_indexes.items()
+        ]
+        for _, value in keys:
+            hash(value)
+        positions = []
+        for name, sorted_index in self._sorted_indexes.items():
+            value = getattr(record, name)
+            positions.append((sorted_index, value, sorted_index.position(value)))
+
+        for index, value in keys:
+            index.setdefault(value, {})[rid] = record
+        for sorted_index, value, pos in positions:
+            sorted_index.insert(pos, value, rid)
+        self._records[rid] = record
+
+    def remove(self, record: T) -> None:
+        rid = id(record)
+        if self._records.pop(rid, None) is None:
+            raise KeyError(record)
+
+        for name, index in self._hash_indexes.items():
+            value = getattr(record, name)
+            bucket = index[value]
+            del bucket[rid]
+            if not bucket:
+                del index[value]
+        for name, sorted_index in self._sorted_indexes.items():
+            sorted_index.remove(getattr(record, name), rid)
+
+    def replace(self, old: T, new: T) -> T:
+        "replace old with new, only indexes of changed fields are touched"
+        if not isinstance(new, self._struct_type):
+            raise TypeError(f"{new!r} is not an instance of {self._struct_type}")
+
+        old_id, new_id = id(old), id(new)
+        if old_id not in self._records:
+            raise KeyError(old)
+        if new_id != old_id and new_id in self._records:
+            raise ValueError(f"{new!r} is already in the collection")
+
+        # new values are checked before any index is touched
+        for name in self._hash_indexes:
+            hash(getattr(new, name))
+        for name, sorted_index in self._sorted_indexes.items():
+            sorted_index.position(getattr(new, name))
+
+        for name, index in self._hash_indexes.items():
+            old_val, new_val = getattr(old, name), getattr(new, name)
+            if old_val is new_val or old_val == new_val:
+                bucket = index[old_val]
+                del bucket[old_id]
+                bucket[new_id] = new
+                continue
+            bucket = index[old_val]
+            del bucket[old_id]
+            if not bucket:
+                del index[old_val]
+            index.setdefault(new_val, {})[new_id] = new
+
+        for name, sorted_index in self._sorted_indexes.items():
+            sorted_index.remove(getattr(old, name), old_id)
+            sorted_index.add(getattr(new, name), new_id)
+
+        del self._records[old_id]
+        self._records[new_id] = new
+        return new
+
+    def update(self, record: T, **changes) -> T:
+        "replace record with record.but(**changes)"
+        return self.replace(record, record.but(**changes))  # type: ignore
+
+    def _candidates(self, name: str, cond) -> list[int] | None:
+        "ids matching a single condition, None if the field is not indexed"
+        if not isinstance(cond, Range) and (index := self._hash_indexes.get(name)) is not None:
+            return list(index.get(cond, ()))
+        if (sorted_index := self._sorted_indexes.get(name)) is not None:
+            return sorted_index.select(cond) if isinstance(cond, Range) else sorted_index.equal(cond)
+        return None
+
+    def find(self, **conditions) -> list[T]:
+        """
+        records matching all conditions, a condition is either
+        a value to compare with or a `Range`.
+
+        with a single indexed condition, results of a sorted index are in field order.
+        """
+        _check_fields(self._struct_type, self._schema, conditions)
+
+        indexed: list[list[int]] = []
+        scanned: list[tuple[str, ty.Any]] = []
+        for name, cond in conditions.items():
+            if (ids := self._candidates(name, cond)) is None:
+                scanned.append((name, cond))
+            else:
+                indexed.append(ids)
+
+        records = self._records
+        if indexed:
+            indexed.sort(key=len)
+            ids = indexed[0]
+            for other in indexed[1:]:
+                other_ids = set(other)
+                ids = [rid for rid in ids if rid in other_ids]
+            found = [records[rid] for rid in ids]
+        else:
+            found = list(records.values())
+
+        for name, cond in scanned:
+            found = [r for r in found if _match(getattr(r, name), cond)]
+        return found
+
+    def find_one(self, **conditions) -> T | None:
+        found = self.find(**conditions)
+        return found[0] if found else None
@@ -16,3 +16,25 @@ class ArgumentError(Exception):
 
 class MutableFieldError(InvalidTypeError):
     ...
+
+
+class MutableArgumentError(InvalidTypeError):
+    def __str__(self) -> str:
+        msg = f"Argument {self.attr_name} of type {self.type_} is mutable"
+        return msg
+
+
+class FieldNotFoundError(Exception):
+    def __init__(self, attr_name, struct_type) -> None:
+        self.attr_name = attr_name
+        self.struct_type = struct_type
+
+    def __str__(self) -> str:
+        msg = f"{self.struct_type.__name__} has no field {self.attr_name}"
+        return msg
+
+
+class UnsupportedFieldTypeError(InvalidTypeError):
+    def __str__(self) -> str:
+        msg = f"Attribute {self.attr_name} of type {self.type_} is not supported"
+        return msg
@@ -1,7 +1,17 @@
+import enum
+import re
 import typing as ty
-from datetime import date, datetime
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from fractions import Fraction
+from pathlib import PurePath
+from types import EllipsisType, NoneType, NotImplementedType
+from uuid import UUID
+from weakref import WeakKeyDictionary
 
 from .error import InvalidTypeError
+from .persistent import PMap, PVector
+from .schema import get_schema, resolve_schema
 
 SINGLETON = {
     True,
@@ -20,22 +30,88 @@ IMMUTABLE_NONCONTAINER_TYPES = {
 } | SINGLETON
 
 IMMUTABLE_CUSTOM_TYPES = {date, datetime}
-IMMUTABLE_CONTAINER_TYPES = {tuple, frozenset, ty.Union, ty.Literal, ty.ClassVar}
+IMMUTABLE_CONTAINER_TYPES = {
+    tuple,
+    frozenset,
+    PVector,
+    PMap,
+    ty.Union,
+    ty.Literal,
+    ty.ClassVar,
+}
 _EMPTY_SET: ty.Final[set[type]] = set()
+_IMMUTABLE_VALUES: ty.Final = IMMUTABLE_NONCONTAINER_TYPES | IMMUTABLE_CUSTOM_TYPES
+
+# types whose instances, and instances of their subclasses, are immutable
+IMMUTABLE_REGISTRY: set[type] = {
+    t for t in _IMMUTABLE_VALUES if isinstance(t, type)
+} | {
+    NoneType,
+    EllipsisType,
+    NotImplementedType,
+    time,
+    timedelta,
+    timezone,
+    Decimal,
+    Fraction,
+    UUID,
+    PurePath,
+    enum.Enum,
+    range,
+    re.Pattern,
+    tuple,
+    frozenset,
+}
+_MRO_CACHE: ty.MutableMapping[type, bool] = WeakKeyDictionary()
+
+T = ty.TypeVar("T", bound=type)
+
+
+def register_immutable(cls: T) -> T:
+    """
+    register a third party value type as immutable, subclasses included.
 
+    @register_immutable
+    class Money: ...
+    """
+    IMMUTABLE_REGISTRY.add(cls)
+    _MRO_CACHE.clear()
+    return cls
 
-# def check_free(field: type, dynamic_immut_types: ty.Iterable[type] = _EMPTY_SET) -> bool:
 
+def is_type_immutable(cls: type) -> bool:
+    "whether cls or any class in its mro is registered as immutable"
+    try:
+        return _MRO_CACHE[cls]
+    except KeyError:
+        pass
+    except TypeError:  # not weak referenceable
+        return any(base in IMMUTABLE_REGISTRY for base in cls.__mro__)
+
+    verdict = any(base in IMMUTABLE_REGISTRY for base in cls.__mro__)
+    _MRO_CACHE[cls] = verdict
+    return verdict
 
 
 def is_field_immutable(field: type, imtypes: ty.Iterable[type] = _EMPTY_SET) -> bool:
     # Base case: if this is a non-container type, it is immutable
-    if field in (IMMUTABLE_NONCONTAINER_TYPES | IMMUTABLE_CUSTOM_TYPES):
+    if field in _IMMUTABLE_VALUES:
         return True
 
     if field in imtypes:
         return True
 
+    if isinstance(field, type):
+        if field in IMMUTABLE_REGISTRY:
+            return True
+
+        if (schema := get_schema(field)) and schema.immutable:
+            return True
+
+        # subclasses declaring their own fields are still checked field by field
+        if not field.__dict__.get("__annotations__") and is_type_immutable(field):
+            return True
+
     # Get the original type for types from the typing module
     origin = ty.get_origin(field)
 
@@ -51,14 +127,18 @@ def is_field_immutable(field: type, imtypes: ty.Iterable[type] = _EMPTY_SET) ->
     return False
 
 
-def is_class_immutable(cls: type, imtypes: ty.Iterable[type]):
-    # BUG: cosnsider class T(tuple): ...
-    # class B(T): ...
-    # both are subclass of immutable,
-    # yet would be assert to be mutable in current impl
+def is_class_immutable(cls: type, imtypes: ty.Iterable[type] = _EMPTY_SET):
+    if schema := resolve_schema(cls):
+        if schema.immutable:
+            return True
+        namespace = schema.types.items()
+        for attr_type in schema.types.values():
+            if isinstance(attr_type, str):
+                # an undefined forward reference is not a mutable type
+                raise NameError(f"name {attr_type!r} is not defined", name=attr_type)
+    else:
+        namespace = ty.get_type_hints(cls).items()
 
-    annotations = ty.get_type_hints(cls)
-    namespace = annotations.items()
     for attr_name, attr_type in namespace:
         if not is_field_immutable(attr_type, imtypes):
             raise InvalidTypeError(attr_name, attr_type)
@@ -0,0 +1,159 @@
+import typing as ty
+from collections import OrderedDict
+from functools import update_wrapper
+from threading import RLock
+from time import monotonic
+from types import MethodType
+
+from .error import MutableArgumentError
+from .schema import get_schema
+
+_KWARGS_MARK = object()
+# equal-but-distinct instances aliased to a single entry
+_MAX_ALIASES = 8
+
+
+class CacheInfo(ty.NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _Entry:
+    __slots__ = ("key", "value", "expires_at", "aliases")
+
+    def __init__(self, key, value, expires_at: float | None):
+        self.key = key
+        self.value = value
+        self.expires_at = expires_at
+        # identity keys pointing to this entry, see MemoizedFunction.__call__
+        self.aliases: dict[tuple, tuple] = {}
+
+
+def _check_immutable(args: tuple, kwargs: dict) -> None:
+    for pos, arg in enumerate(args):
+        schema = get_schema(type(arg))
+        if schema is not None and not schema.immutable:
+            raise MutableArgumentError(pos, type(arg))
+
+    for name, arg in kwargs.items():
+        schema = get_schema(type(arg))
+        if schema is not None and not schema.immutable:
+            raise MutableArgumentError(name, type(arg))
+
+
+class MemoizedFunction:
+    """
+    LRU/TTL memoization for pure functions taking frozen structs.
+
+    Lookups first go through the identities of the arguments,
+    so calling again with the very same instances skips the generated `__hash__`
+    which builds a field tuple each time.
+    an identity key holds references to its arguments while it is cached,
+    so their ids can not be reused by other objects.
+    On identity miss, the arguments are hashed as usual and the identity is
+    recorded as an alias of the matched entry.
+    """
+
+    def __init__(
+        self, func: ty.Callable, maxsize: int | None = 128, ttl: float | None = None
+    ):
+        if maxsize is not None and maxsize < 0:
+            maxsize = 0
+        self.__wrapped__ = func
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict[ty.Any, _Entry] = OrderedDict()
+        self._identities: dict[tuple, _Entry] = {}
+        self._lock = RLock()
+        self._hits = 0
+        self._misses = 0
+        update_wrapper(self, func)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return MethodType(self, instance)
+
+    def _evict(self, entry: _Entry) -> None:
+        self._entries.pop(entry.key, None)
+        for ident in entry.aliases:
+            self._identities.pop(ident, None)
+
+    def _lookup(self, ident: tuple, args: tuple, kwargs: dict) -> _Entry | None:
+        if (entry := self._identities.get(ident)) is None:
+            _check_immutable(args, kwargs)
+            key = args + (_KWARGS_MARK,) + tuple(kwargs.items()) if kwargs else args
+            if (entry := self._entries.get(key)) is None:
+                return None
+            if len(entry.aliases) < _MAX_ALIASES:
+                entry.aliases[ident] = (args, kwargs)
+                self._identities[ident] = entry
+
+        if entry.expires_at is not None and entry.expires_at < monotonic():
+            self._evict(entry)
+            return None
+
+        self._entries.move_to_end(entry.key)
+        return entry
+
+    def __call__(self, *args, **kwargs):
+        ident = (*map(id, args), *kwargs, *map(id, kwargs.values()))
+
+        with self._lock:
+            if (entry := self._lookup(ident, args, kwargs)) is not None:
+                self._hits += 1
+                return entry.value
+            self._misses += 1
+
+        value = self.__wrapped__(*args, **kwargs)
+
+        if self._maxsize == 0:
+            return value
+
+        key = args + (_KWARGS_MARK,) + tuple(kwargs.items()) if kwargs else args
+        expires_at = monotonic() + self._ttl if self._ttl is not None else None
+        entry = _Entry(key, value, expires_at)
+        entry.aliases[ident] = (args, kwargs)
+
+        with self._lock:
+            if (stale := self._entries.get(key)) is not None:
+                self._evict(stale)
+            self._entries[key] = entry
+            self._identities[ident] = entry
+            if self._maxsize is not None and len(self._entries) > self._maxsize:
+                _, oldest = self._entries.popitem(last=False)
+                self._evict(oldest)
+
+        return value
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._identities.clear()
+            self._hits = self._misses = 0
+
+
+def memoize(maxsize: int | None = 128, ttl: float | None = None):
+    """
+    memoize a pure function with LRU eviction, entries older than `ttl` seconds
+    are dropped on access, non-frozen structs as arguments are refused.
+
+    @memoize(maxsize=1024, ttl=60)
+    def price(order: Order) -> Decimal: ...
+    """
+
+    def decorator(func: ty.Callable) -> MemoizedFunction:
+        return MemoizedFunction(func, maxsize=maxsize, ttl=ttl)
+
+    return decorator
@@ -0,0 +1,106 @@
+import typing as ty
+from operator import attrgetter
+
+from .error import FieldNotFoundError
+from .schema import StructSchema, get_schema, values_getter
+
+ORDER_KEY_ATTR = "__baozi_order_key__"
+
+T = ty.TypeVar("T")
+
+
+def make_sort_key(cls: type, *names: str) -> ty.Callable[[ty.Any], ty.Any]:
+    """
+    key function returning the given fields of an instance,
+    a tuple for more than one field. without names, the tuple of compare fields.
+    """
+    schema = get_schema(cls)
+    if schema is None:
+        raise TypeError(f"{cls.__name__} is not a struct class")
+    if not names:
+        names = tuple(f.name for f in schema.fields if f.compare)
+
+    for name in names:
+        if name not in schema.offsets:
+            raise FieldNotFoundError(name, cls)
+    if len(names) == 1:
+        return attrgetter(names[0])
+    return values_getter(names)
+
+
+def sort_structs(
+    items: ty.Iterable[T], *names: str, reverse: bool = False
+) -> list[T]:
+    """
+    sort structs of a same class by the given fields,
+    a field prefixed with '-' is sorted in descending order.
+
+    sort_structs(users, "-age", "name")
+
+    keys are computed once per item and the list is sorted by them,
+    list.sort(key=...) is a decorate-sort-undecorate implemented in C.
+    with mixed directions, the list is sorted once per run of same direction fields,
+    from the last run to the first, relying on sort stability.
+    """
+    result = list(items)
+    if not result:
+        return result
+
+    cls = type(result[0])
+    fields = [(name.lstrip("-"), name.startswith("-")) for name in names]
+
+    runs: list[tuple[list[str], bool]] = []
+    for name, desc in fields:
+        if runs and runs[-1][1] == desc:
+            runs[-1][0].append(name)
+        else:
+            runs.append(([name], desc))
+
+    if not runs:
+        result.sort(key=make_sort_key(cls), reverse=reverse)
+        return result
+
+    for run_names, desc in reversed(runs):
+        result.sort(key=make_sort_key(cls, *run_names), reverse=desc != reverse)
+    return result
+
+
+def install_cached_order(cls: type, schema: StructSchema) -> None:
+    """
+    replace generated ordering methods of a frozen class with ones
+    comparing an ordering tuple computed once per instance.
+    """
+    values = values_getter(tuple(f.name for f in schema.fields if f.compare))
+    set_key = object.__setattr__
+
+    def order_key(self):
+        try:
+            return getattr(self, ORDER_KEY_ATTR)
+        except AttributeError:
+            key = values(self)
+            set_key(self, ORDER_KEY_ATTR, key)
+            return key
+
+    def __lt__(self, other):
+        if other.__class__ is self.__class__:
+            return order_key(self) < order_key(other)
+        return NotImplemented
+
+    def __le__(self, other):
+        if other.__class__ is self.__class__:
+            return order_key(self) <= order_key(other)
+        return NotImplemented
+
+    def __gt__(self, other):
+        if other.__class__ is self.__class__:
+            return order_key(self) > order_key(other)
+        return NotImplemented
+
+    def __ge__(self, other):
+        if other.__class__ is self.__class__:
+            return order_key(self) >= order_key(other)
+        return NotImplemented
+
+    for method in (__lt__, __le__, __gt__, __ge__):
+        method.__qualname__ = f"{cls.__qualname__}.{method.__name__}"
+        setattr(cls, method.__name__, method)
@@ -0,0 +1,93 @@
+import typing as ty
+from dataclasses import replace
+
+from .codegen import create_fn, module_globals, set_qualname
+from .schema import get_schema
+
+DIFF_FN = "__BAOZI_DIFF__"
+
+T = ty.TypeVar("T")
+
+
+class Patch(dict):
+    """
+    changed fields mapped to their new values,
+    a field holding a struct that changed partly maps to a nested Patch.
+    """
+
+    def __repr__(self) -> str:
+        return f"Patch({dict.__repr__(self)})"
+
+
+def _make_diff(cls: type) -> ty.Callable:
+    schema = get_schema(cls)
+    if schema is None:
+        raise TypeError(f"{cls.__name__} is not a struct class")
+
+    locals: dict[str, ty.Any] = dict(_Patch=Patch, _diff=diff)
+    body = ["patch = _Patch()"]
+    for i, name in enumerate(schema.field_names):
+        body.extend([f"x = a.{name}", f"y = b.{name}", "if x is not y:"])
+
+        field_type = schema.types[name]
+        if isinstance(field_type, type) and get_schema(field_type) is not None:
+            # identical sub-objects are skipped above, equal ones are diffed field by field
+            locals[f"_type_{i}"] = field_type
+            body.extend(
+                [
+                    f"  if deep and type(x) is _type_{i} and type(y) is _type_{i}:",
+                    "    if sub := _diff(x, y):",
+                    f"      patch[{name!r}] = sub",
+                    "  elif x != y:",
+                    f"    patch[{name!r}] = y",
+                ]
+            )
+        else:
+            body.extend(["  if x != y:", f"    patch[{name!r}] = y"])
+
+    body.append("return patch")
+    fn = create_fn(
+        "diff", ("a", "b", "deep"), body, globals=module_globals(cls), locals=locals
+    )
+    return set_qualname(cls, fn)
+
+
+def diff(a: T, b: T, deep: bool = True) -> Patch:
+    """
+    fields of b that differ from a, compared in field order.
+    with `deep`, nested structs of the same class are diffed into nested patches,
+    otherwise the patch can be passed to `but` directly: `a.but(**diff(a, b, deep=False))`
+    """
+    cls = type(a)
+    if type(b) is not cls:
+        raise TypeError(f"can not diff {cls.__name__} with {type(b).__name__}")
+
+    try:
+        diff_fn = cls.__dict__[DIFF_FN]
+    except KeyError:
+        diff_fn = _make_diff(cls)
+        setattr(cls, DIFF_FN, staticmethod(diff_fn))
+    return diff_fn(a, b, deep)
+
+
+def apply_patch(obj: T, patch: ty.Mapping[str, ty.Any]) -> T:
+    """
+    apply patch to obj, frozen structs are updated through `but` and a new
+    instance is returned, mutable structs are updated in place and returned.
+    """
+    changes = {
+        name: apply_patch(getattr(obj, name), value) if isinstance(value, Patch) else value
+        for name, value in patch.items()
+    }
+
+    if (schema := get_schema(type(obj))) is None:
+        raise TypeError(f"{type(obj).__name__} is not a struct class")
+
+    if schema.frozen:
+        if (but := getattr(obj, "but", None)) is not None:
+            return but(**changes)
+        return replace(obj, **changes)  # type: ignore
+
+    for name, value in changes.items():
+        setattr(obj, name, value)
+    return obj
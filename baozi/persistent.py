@@ -0,0 +1,405 @@
+"""
+persistent collections with structural sharing.
+
+updates return a new collection and share all untouched nodes with the old one,
+so replacing one entry costs O(log32 n) instead of copying the whole container.
+
+PVector is a 32-way trie of tuples,
+PMap is a hash array mapped trie(HAMT) keyed on python hash.
+"""
+
+import typing as ty
+from collections.abc import Iterable, ItemsView, Mapping, Sequence, ValuesView
+
+T = ty.TypeVar("T")
+K = ty.TypeVar("K")
+V = ty.TypeVar("V")
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+_HASH_MASK = (1 << 64) - 1
+
+
+# ============ PVector ============
+
+
+def _new_path(level: int, leaf: tuple) -> tuple:
+    node = leaf
+    for _ in range(0, level, _BITS):
+        node = (node,)
+    return node
+
+
+def _push(node: tuple, level: int, index: int, value) -> tuple:
+    if level == 0:
+        return node + (value,)
+    sub = (index >> level) & _MASK
+    if sub < len(node):
+        child = _push(node[sub], level - _BITS, index, value)
+        return node[:sub] + (child,) + node[sub + 1 :]
+    return node + (_new_path(level - _BITS, (value,)),)
+
+
+def _assoc(node: tuple, level: int, index: int, value) -> tuple:
+    sub = (index >> level) & _MASK
+    if level == 0:
+        child = value
+    else:
+        child = _assoc(node[sub], level - _BITS, index, value)
+    return node[:sub] + (child,) + node[sub + 1 :]
+
+
+def _leaves(node: tuple, level: int) -> ty.Iterator[tuple]:
+    if level == 0:
+        yield node
+        return
+    for child in node:
+        yield from _leaves(child, level - _BITS)
+
+
+class PVector(Sequence[T]):
+    __slots__ = ("_count", "_shift", "_root", "_hash")
+
+    def __init__(self, iterable: Iterable[T] = ()):
+        items = tuple(iterable)
+        nodes: list[tuple] = [
+            items[i : i + _WIDTH] for i in range(0, len(items), _WIDTH)
+        ] or [()]
+        shift = 0
+        while len(nodes) > 1:
+            nodes = [tuple(nodes[i : i + _WIDTH]) for i in range(0, len(nodes), _WIDTH)]
+            shift += _BITS
+
+        self._count = len(items)
+        self._shift = shift
+        self._root = nodes[0]
+        self._hash: int | None = None
+
+    @classmethod
+    def _create(cls, count: int, shift: int, root: tuple) -> "PVector[T]":
+        vec = object.__new__(cls)
+        vec._count = count
+        vec._shift = shift
+        vec._root = root
+        vec._hash = None
+        return vec
+
+    def _check_index(self, index: int) -> int:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("PVector index out of range")
+        return index
+
+    def __len__(self) -> int:
+        return self._count
+
+    @ty.overload
+    def __getitem__(self, index: int) -> T:
+        ...
+
+    @ty.overload
+    def __getitem__(self, index: slice) -> "PVector[T]":
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.__class__(tuple(self)[index])
+
+        index = self._check_index(index)
+        node = self._root
+        for level in range(self._shift, 0, -_BITS):
+            node = node[(index >> level) & _MASK]
+        return node[index & _MASK]
+
+    def __iter__(self) -> ty.Iterator[T]:
+        for leaf in _leaves(self._root, self._shift):
+            yield from leaf
+
+    def set(self, index: int, value: T) -> "PVector[T]":
+        "return a new vector with item at index replaced"
+        index = self._check_index(index)
+        root = _assoc(self._root, self._shift, index, value)
+        return self._create(self._count, self._shift, root)
+
+    def append(self, value: T) -> "PVector[T]":
+        "return a new vector with value added to the end"
+        count, shift = self._count, self._shift
+        if count == 0:
+            return self._create(1, 0, (value,))
+        if count == 1 << (shift + _BITS):
+            root = (self._root, _new_path(shift, (value,)))
+            return self._create(count + 1, shift + _BITS, root)
+        return self._create(count + 1, shift, _push(self._root, shift, count, value))
+
+    def extend(self, values: Iterable[T]) -> "PVector[T]":
+        vec = self
+        for value in values:
+            vec = vec.append(value)
+        return vec
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, PVector):
+            return NotImplemented
+        return self._count == other._count and all(
+            a is b or a == b for a, b in zip(self, other)
+        )
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(tuple(self))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    def __reduce__(self):
+        return (self.__class__, (tuple(self),))
+
+
+# ============ PMap ============
+
+_NODE = object()  # marks a key slot holding a sub node
+
+
+def _hash(key) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def _bitpos(keyhash: int, shift: int) -> int:
+    return 1 << ((keyhash >> shift) & _MASK)
+
+
+def _merge(shift: int, key1, val1, keyhash2: int, key2, val2):
+    keyhash1 = _hash(key1)
+    if keyhash1 == keyhash2:
+        return _CollisionNode(keyhash1, ((key1, val1), (key2, val2)))
+    node, _ = _EMPTY_NODE.assoc(shift, keyhash1, key1, val1)
+    node, _ = node.assoc(shift, keyhash2, key2, val2)
+    return node
+
+
+class _BitmapNode:
+    """
+    `array` holds two slots per entry, either `key, value`
+    or `_NODE, sub_node`, ordered by bit position in `bitmap`
+    """
+
+    __slots__ = ("bitmap", "array")
+
+    def __init__(self, bitmap: int, array: tuple):
+        self.bitmap = bitmap
+        self.array = array
+
+    def find(self, shift: int, keyhash: int, key, default):
+        bit = _bitpos(keyhash, shift)
+        if not self.bitmap & bit:
+            return default
+        idx = 2 * (self.bitmap & (bit - 1)).bit_count()
+        k, v = self.array[idx], self.array[idx + 1]
+        if k is _NODE:
+            return v.find(shift + _BITS, keyhash, key, default)
+        if k is key or k == key:
+            return v
+        return default
+
+    def assoc(self, shift: int, keyhash: int, key, val) -> tuple[ty.Any, bool]:
+        bit = _bitpos(keyhash, shift)
+        idx = 2 * (self.bitmap & (bit - 1)).bit_count()
+        array = self.array
+
+        if not self.bitmap & bit:
+            return _BitmapNode(self.bitmap | bit, array[:idx] + (key, val) + array[idx:]), True
+
+        k, v = array[idx], array[idx + 1]
+        if k is _NODE:
+            sub, added = v.assoc(shift + _BITS, keyhash, key, val)
+            if sub is v:
+                return self, False
+            return _BitmapNode(self.bitmap, array[: idx + 1] + (sub,) + array[idx + 2 :]), added
+
+        if k is key or k == key:
+            if v is val:
+                return self, False
+            return _BitmapNode(self.bitmap, array[: idx + 1] + (val,) + array[idx + 2 :]), False
+
+        sub = _merge(shift + _BITS, k, v, keyhash, key, val)
+        return _BitmapNode(self.bitmap, array[:idx] + (_NODE, sub) + array[idx + 2 :]), True
+
+    def without(self, shift: int, keyhash: int, key):
+        "return self if key is absent, None if the node becomes empty"
+        bit = _bitpos(keyhash, shift)
+        if not self.bitmap & bit:
+            return self
+        idx = 2 * (self.bitmap & (bit - 1)).bit_count()
+        array = self.array
+        k, v = array[idx], array[idx + 1]
+
+        if k is _NODE:
+            sub = v.without(shift + _BITS, keyhash, key)
+            if sub is v:
+                return self
+            if sub is not None:
+                return _BitmapNode(self.bitmap, array[: idx + 1] + (sub,) + array[idx + 2 :])
+        elif not (k is key or k == key):
+            return self
+
+        if (bitmap := self.bitmap ^ bit) == 0:
+            return None
+        return _BitmapNode(bitmap, array[:idx] + array[idx + 2 :])
+
+    def items(self) -> ty.Iterator[tuple]:
+        array = self.array
+        for i in range(0, len(array), 2):
+            if array[i] is _NODE:
+                yield from array[i + 1].items()
+            else:
+                yield array[i], array[i + 1]
+
+
+class _CollisionNode:
+    "keys sharing the full 64 bits hash"
+
+    __slots__ = ("keyhash", "pairs")
+
+    def __init__(self, keyhash: int, pairs: tuple[tuple, ...]):
+        self.keyhash = keyhash
+        self.pairs = pairs
+
+    def _index(self, key) -> int:
+        for i, (k, _) in enumerate(self.pairs):
+            if k is key or k == key:
+                return i
+        return -1
+
+    def find(self, shift: int, keyhash: int, key, default):
+        if keyhash != self.keyhash or (i := self._index(key)) < 0:
+            return default
+        return self.pairs[i][1]
+
+    def assoc(self, shift: int, keyhash: int, key, val) -> tuple[ty.Any, bool]:
+        if keyhash != self.keyhash:
+            node = _BitmapNode(_bitpos(self.keyhash, shift), (_NODE, self))
+            return node.assoc(shift, keyhash, key, val)
+        if (i := self._index(key)) < 0:
+            return _CollisionNode(keyhash, self.pairs + ((key, val),)), True
+        if self.pairs[i][1] is val:
+            return self, False
+        pairs = self.pairs[:i] + ((key, val),) + self.pairs[i + 1 :]
+        return _CollisionNode(keyhash, pairs), False
+
+    def without(self, shift: int, keyhash: int, key):
+        if keyhash != self.keyhash or (i := self._index(key)) < 0:
+            return self
+        if len(self.pairs) == 1:
+            return None
+        return _CollisionNode(keyhash, self.pairs[:i] + self.pairs[i + 1 :])
+
+    def items(self) -> ty.Iterator[tuple]:
+        yield from self.pairs
+
+
+_EMPTY_NODE = _BitmapNode(0, ())
+_MISSING = object()
+
+
+class _PMapItems(ItemsView):
+    def __iter__(self):
+        return self._mapping._root.items()
+
+
+class _PMapValues(ValuesView):
+    def __iter__(self):
+        for _, val in self._mapping._root.items():
+            yield val
+
+
+class PMap(Mapping[K, V]):
+    __slots__ = ("_root", "_count", "_hash")
+
+    def __init__(self, mapping: Mapping[K, V] | Iterable[tuple[K, V]] = ()):
+        root, count = _EMPTY_NODE, 0
+        items = mapping.items() if isinstance(mapping, Mapping) else mapping
+        for key, val in items:
+            root, added = root.assoc(0, _hash(key), key, val)
+            count += added
+        self._root = root
+        self._count = count
+        self._hash: int | None = None
+
+    @classmethod
+    def _create(cls, root, count: int) -> "PMap[K, V]":
+        pmap = object.__new__(cls)
+        pmap._root = root
+        pmap._count = count
+        pmap._hash = None
+        return pmap
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, key: K) -> V:
+        val = self._root.find(0, _hash(key), key, _MISSING)
+        if val is _MISSING:
+            raise KeyError(key)
+        return val
+
+    def get(self, key: K, default=None):  # type: ignore
+        return self._root.find(0, _hash(key), key, default)
+
+    def __contains__(self, key) -> bool:
+        return self._root.find(0, _hash(key), key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> ty.Iterator[K]:
+        for key, _ in self._root.items():
+            yield key
+
+    def items(self) -> ItemsView[K, V]:
+        return _PMapItems(self)
+
+    def values(self) -> ValuesView[V]:
+        return _PMapValues(self)
+
+    def set(self, key: K, val: V) -> "PMap[K, V]":
+        "return a new map with key set to val"
+        root, added = self._root.assoc(0, _hash(key), key, val)
+        if root is self._root:
+            return self
+        return self._create(root, self._count + added)
+
+    def delete(self, key: K) -> "PMap[K, V]":
+        "return a new map without key, raise KeyError if key is absent"
+        root = self._root.without(0, _hash(key), key)
+        if root is self._root:
+            raise KeyError(key)
+        return self._create(root if root is not None else _EMPTY_NODE, self._count - 1)
+
+    def update(self, mapping: Mapping[K, V]) -> "PMap[K, V]":
+        pmap = self
+        for key, val in mapping.items():
+            pmap = pmap.set(key, val)
+        return pmap
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Mapping) or len(self) != len(other):
+            return False
+        for key, val in self.items():
+            if other.get(key, _MISSING) != val:
+                return False
+        return True
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self.items()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.items())!r})"
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self.items()),))
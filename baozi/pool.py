@@ -0,0 +1,93 @@
+import inspect
+import typing as ty
+from contextlib import contextmanager
+
+from .schema import get_schema
+
+T = ty.TypeVar("T")
+
+
+class StructPool(ty.Generic[T]):
+    """
+    reuse instances of a mutable struct instead of allocating new ones.
+
+    acquired instances are re-initialized in place by the generated `__init__`,
+    so fields are reset exactly as a fresh instance would be, default factories included.
+    at most `maxsize` released instances are kept.
+
+    with `debug`, outstanding instances are tracked and releasing an instance
+    not acquired from the pool, or releasing it twice, raises ValueError.
+
+    pool = StructPool(Message, maxsize=128)
+    with pool.borrow(topic="a", body=b"") as msg:
+        ...
+    """
+
+    def __init__(self, struct_type: type[T], maxsize: int = 64, debug: bool = False):
+        schema = get_schema(struct_type)
+        if schema is None:
+            raise TypeError(f"{struct_type.__name__} is not a struct class")
+        if schema.frozen:
+            raise TypeError(f"{struct_type.__name__} is frozen and can not be pooled")
+
+        pre_init = getattr(struct_type, "__pre_init__", None)
+        if pre_init is not None and not inspect.ismethod(pre_init):
+            pre_init = None
+
+        self._struct_type = struct_type
+        self._new = struct_type.__new__
+        self._init = struct_type.__init__
+        self._pre_init = pre_init
+        self._maxsize = maxsize
+        self._free: list[T] = []
+        self._outstanding: set[int] | None = set() if debug else None
+
+    @property
+    def size(self) -> int:
+        "number of released instances ready for reuse"
+        return len(self._free)
+
+    @property
+    def outstanding(self) -> int | None:
+        "number of acquired but unreleased instances, None unless debug"
+        if self._outstanding is None:
+            return None
+        return len(self._outstanding)
+
+    def acquire(self, **fields) -> T:
+        if self._pre_init is not None:
+            fields = self._pre_init(**fields)
+
+        if self._free:
+            obj = self._free.pop()
+        else:
+            obj = self._new(self._struct_type)
+        self._init(obj, **fields)
+
+        if self._outstanding is not None:
+            self._outstanding.add(id(obj))
+        return obj
+
+    def release(self, obj: T) -> None:
+        if type(obj) is not self._struct_type:
+            raise TypeError(f"{obj!r} is not an instance of {self._struct_type}")
+
+        if self._outstanding is not None:
+            try:
+                self._outstanding.remove(id(obj))
+            except KeyError:
+                raise ValueError(f"{obj!r} is not acquired from this pool") from None
+
+        if len(self._free) < self._maxsize:
+            self._free.append(obj)
+
+    @contextmanager
+    def borrow(self, **fields) -> ty.Iterator[T]:
+        obj = self.acquire(**fields)
+        try:
+            yield obj
+        finally:
+            self.release(obj)
+
+    def clear(self) -> None:
+        self._free.clear()
@@ -0,0 +1,197 @@
+import hashlib
+import sys
+import typing as ty
+from dataclasses import MISSING, fields
+from operator import attrgetter
+from types import MappingProxyType
+
+SCHEMA_ATTR = "__BAOZI_SCHEMA__"
+
+
+class FieldInfo(ty.NamedTuple):
+    name: str
+    type: ty.Any
+    default: ty.Any
+    default_factory: ty.Any
+    offset: int
+    converter: ty.Callable[[ty.Any], ty.Any]
+    init: bool
+    compare: bool
+
+    @property
+    def required(self) -> bool:
+        return self.default is MISSING and self.default_factory is MISSING
+
+
+class StructSchema(ty.NamedTuple):
+    """
+    precomputed field metadata of a struct class,
+    built once at class creation and shared by every subsystem of baozi.
+
+    offsets are positions of fields in `field_names`,
+    which is also the layout of the flat value tuple used for pickling.
+    """
+
+    fields: tuple[FieldInfo, ...]
+    field_names: tuple[str, ...]
+    types: ty.Mapping[str, ty.Any]
+    defaults: ty.Mapping[str, ty.Any]
+    offsets: ty.Mapping[str, int]
+    converters: ty.Mapping[str, ty.Callable[[ty.Any], ty.Any]]
+    frozen: bool
+    immutable: bool
+
+
+def _resolve_type(cls: type, name: str, annotation: ty.Any) -> ty.Any:
+    "evaluate a string annotation where it is declared, kept as is while unresolvable"
+    if isinstance(annotation, ty.ForwardRef):
+        annotation = annotation.__forward_arg__
+    if not isinstance(annotation, str):
+        return annotation
+
+    owner = next(
+        (b for b in cls.__mro__ if name in b.__dict__.get("__annotations__", {})),
+        cls,
+    )
+    globalns = getattr(sys.modules.get(owner.__module__), "__dict__", {})
+    try:
+        return eval(annotation, globalns, dict(vars(owner)))
+    except Exception:
+        return annotation
+
+
+def _resolve_hints(cls: type) -> dict[str, ty.Any]:
+    try:
+        return ty.get_type_hints(cls)
+    except (NameError, TypeError):
+        # some forward refs are not defined yet, resolve the others one by one
+        return {f.name: _resolve_type(cls, f.name, f.type) for f in fields(cls)}
+
+
+def _make_schema(
+    infos: tuple[FieldInfo, ...], frozen: bool, immutable: bool
+) -> StructSchema:
+    return StructSchema(
+        fields=infos,
+        field_names=tuple(info.name for info in infos),
+        types=MappingProxyType({info.name: info.type for info in infos}),
+        defaults=MappingProxyType(
+            {info.name: info.default for info in infos if info.default is not MISSING}
+        ),
+        offsets=MappingProxyType({info.name: info.offset for info in infos}),
+        converters=MappingProxyType({info.name: info.converter for info in infos}),
+        frozen=frozen,
+        immutable=immutable,
+    )
+
+
+def build_schema(cls: type, frozen: bool = False) -> StructSchema:
+    """
+    build schema from a dataclass, the immutability verdict starts as False.
+    types that can not be resolved yet are kept as strings, see `resolve_schema`
+    """
+
+    hints = _resolve_hints(cls)
+    infos = tuple(
+        FieldInfo(
+            name=f.name,
+            type=(field_type := hints.get(f.name, f.type)),
+            default=f.default,
+            default_factory=f.default_factory,
+            offset=offset,
+            converter=field_type,
+            init=f.init,
+            compare=f.compare,
+        )
+        for offset, f in enumerate(fields(cls))
+    )
+    return _make_schema(infos, frozen=frozen, immutable=False)
+
+
+def is_resolved(schema: StructSchema) -> bool:
+    "False while a field type is still a string forward reference"
+    return not any(isinstance(info.type, str) for info in schema.fields)
+
+
+def resolve_schema(cls: type) -> StructSchema | None:
+    """
+    return schema of cls, resolving forward references left by `build_schema`
+    against the now defined classes, the resolved schema replaces the stored one.
+    """
+    if not isinstance(cls, type):
+        cls = type(cls)
+    if (schema := get_schema(cls)) is None or is_resolved(schema):
+        return schema
+
+    infos = []
+    for info in schema.fields:
+        if isinstance(info.type, str):
+            field_type = _resolve_type(cls, info.name, info.type)
+            info = info._replace(type=field_type, converter=field_type)
+        infos.append(info)
+
+    resolved = _make_schema(tuple(infos), schema.frozen, schema.immutable)
+    return set_schema(cls, resolved)
+
+
+def values_getter(names: tuple[str, ...]) -> ty.Callable[[ty.Any], tuple]:
+    "return a function reading the given attributes of an object as a tuple"
+    match names:
+        case ():
+            return lambda obj: ()
+        case (name,):
+            getter = attrgetter(name)
+            return lambda obj: (getter(obj),)
+        case _:
+            return attrgetter(*names)
+
+
+def _type_token(tp: ty.Any, seen: set[type]) -> str:
+    if isinstance(tp, type) and get_schema(tp) is not None:
+        return _describe(tp, seen)
+    if args := ty.get_args(tp):
+        origin = ty.get_origin(tp)
+        inner = ", ".join(_type_token(arg, seen) for arg in args)
+        return f"{getattr(origin, '__qualname__', repr(origin))}[{inner}]"
+    return getattr(tp, "__qualname__", repr(tp))
+
+
+def _describe(cls: type, seen: set[type]) -> str:
+    name = f"{cls.__module__}.{cls.__qualname__}"
+    if cls in seen:
+        return name
+    seen.add(cls)
+
+    schema = get_schema(cls)
+    assert schema is not None
+    parts = []
+    for info in schema.fields:
+        part = f"{info.name}: {_type_token(info.type, seen)}"
+        if info.default is not MISSING:
+            part += f" = {info.default!r}"
+        elif info.default_factory is not MISSING:
+            part += f" = {getattr(info.default_factory, '__qualname__', '?')}()"
+        parts.append(part)
+    return f"{name}({'; '.join(parts)})"
+
+
+def schema_fingerprint(cls: type) -> str:
+    """
+    sha256 hex digest of the field names, types and defaults of a struct class,
+    nested struct types included, changes whenever the schema does.
+    """
+    if get_schema(cls) is None:
+        raise TypeError(f"{cls.__name__} is not a struct class")
+    return hashlib.sha256(_describe(cls, set()).encode()).hexdigest()
+
+
+def set_schema(cls: type, schema: StructSchema) -> StructSchema:
+    setattr(cls, SCHEMA_ATTR, schema)
+    return schema
+
+
+def get_schema(cls: type) -> StructSchema | None:
+    "return schema defined by cls itself, schema of parent classes are ignored"
+    if not isinstance(cls, type):
+        cls = type(cls)
+    return cls.__dict__.get(SCHEMA_ATTR)
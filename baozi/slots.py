@@ -1,5 +1,14 @@
 import itertools
-from dataclasses import _process_class, fields
+import pickle
+from dataclasses import _process_class
+
+from .codegen import create_fn, module_globals, set_qualname, struct_codegen
+from .schema import StructSchema, build_schema, get_schema, set_schema
+
+FROM_VALUES = "__BAOZI_FROM_VALUES__"
+BUFFER_TYPES = (bytes, bytearray)
+# smaller buffers are cheaper to copy in-band than to wrap
+BUFFER_MIN_SIZE = 1024
 
 
 def _get_slots(cls: type):
@@ -15,21 +24,115 @@ def _get_slots(cls: type):
 
 
 def _dataclass_getstate(self):
-    return [getattr(self, f.name) for f in fields(self)]
+    return [getattr(self, name) for name in get_schema(self).field_names]
 
 
 def _dataclass_setstate(self, state):
-    for field, value in zip(fields(self), state):
+    for name, value in zip(get_schema(self).field_names, state):
         # use setattr because dataclass may be frozen
-        object.__setattr__(self, field.name, value)
+        object.__setattr__(self, name, value)
+
+
+def _to_buffer(value):
+    if type(value) in BUFFER_TYPES and len(value) >= BUFFER_MIN_SIZE:
+        return pickle.PickleBuffer(value)
+    return value
+
+
+def _bytes_from_buffer(value):
+    if isinstance(value, (pickle.PickleBuffer, memoryview)):
+        return bytes(value)
+    return value
+
+
+def _bytearray_from_buffer(value):
+    if isinstance(value, (pickle.PickleBuffer, memoryview)):
+        return bytearray(value)
+    return value
+
+
+def _make_from_values(cls, schema: StructSchema):
+    "build instance from flat values in schema order, bypassing __init__"
+    locals = {"__baozi_cls__": cls, "__baozi_new__": object.__new__}
+    # locals are prefixed and indexed, so field names can not shadow them
+    body = ["__baozi_self__ = __baozi_new__(__baozi_cls__)"]
+
+    names = schema.field_names
+    if names:
+        targets = ", ".join(f"__baozi_v{i}" for i in range(len(names)))
+        body.append(f"{targets}, = __baozi_values__")
+
+    for i, name in enumerate(names):
+        locals[f"__baozi_set{i}"] = getattr(cls, name).__set__
+        value = f"__baozi_v{i}"
+        match schema.types[name]:
+            case t if t is bytes:
+                locals["__baozi_unbuffer_bytes"] = _bytes_from_buffer
+                value = f"__baozi_unbuffer_bytes({value})"
+            case t if t is bytearray:
+                locals["__baozi_unbuffer_bytearray"] = _bytearray_from_buffer
+                value = f"__baozi_unbuffer_bytearray({value})"
+        body.append(f"__baozi_set{i}(__baozi_self__, {value})")
+
+    body.append("return __baozi_self__")
+    return create_fn(
+        FROM_VALUES,
+        ("__baozi_values__",),
+        body,
+        globals=module_globals(cls),
+        locals=locals,
+    )
 
 
-def _add_slots(cls, is_frozen: bool, weakref_slot: bool):
+def _make_reduce(cls, schema: StructSchema):
+    """
+    pickle slotted struct as (Cls.__BAOZI_FROM_VALUES__, flat value tuple),
+    bytes/bytearray fields are passed as PickleBuffer under protocol 5
+    so that they can be transferred out-of-band.
+    """
+    locals = {
+        "_cls": cls,
+        "_rebuild": getattr(cls, FROM_VALUES),
+        "_buffer": _to_buffer,
+        "_default_reduce": object.__reduce_ex__,
+    }
+    names = schema.field_names
+    values = "".join(f"self.{name}," for name in names)
+    buffered = "".join(
+        f"_buffer(self.{name})," if schema.types[name] in BUFFER_TYPES else f"self.{name},"
+        for name in names
+    )
+
+    body = [
+        # subclasses that opt out of slots do not share our layout
+        "if type(self) is not _cls:",
+        "  return _default_reduce(self, protocol)",
+    ]
+    if buffered != values:
+        body.extend(
+            [
+                "if protocol >= 5:",
+                f"  return (_rebuild, (({buffered}),))",
+            ]
+        )
+    body.append(f"return (_rebuild, (({values}),))")
+    return create_fn(
+        "__reduce_ex__",
+        ("self", "protocol"),
+        body,
+        globals=module_globals(cls),
+        locals=locals,
+    )
+
+
+def _add_slots(
+    cls, is_frozen: bool, weakref_slot: bool, extra_slots: tuple[str, ...] = ()
+):
     if "__slots__" in cls.__dict__:
         raise TypeError(f"{cls.__name__} already specifies __slots__")
 
     cls_dict = dict(cls.__dict__)
-    field_names = tuple(f.name for f in fields(cls))
+    field_names = get_schema(cls).field_names
     inherited_slots = set(
         itertools.chain.from_iterable(map(_get_slots, cls.__mro__[1:-1]))
     )
@@ -39,6 +142,7 @@ def _add_slots(cls, is_frozen: bool, weakref_slot: bool):
             inherited_slots.__contains__,
             itertools.chain(
                 field_names,
+                extra_slots,
                 ("__weakref__",) if weakref_slot else (),
             ),
         ),
@@ -66,17 +170,30 @@ def _add_slots(cls, is_frozen: bool, weakref_slot: bool):
         cls.__getstate__ = _dataclass_getstate
         cls.__setstate__ = _dataclass_setstate
 
+    schema = get_schema(cls)
+    # pickled by reference as `Cls.__BAOZI_FROM_VALUES__`
+    from_values = set_qualname(cls, _make_from_values(cls, schema))
+    setattr(cls, FROM_VALUES, staticmethod(from_values))
+    cls.__reduce_ex__ = set_qualname(cls, _make_reduce(cls, schema))
+
     return cls
 
 
-def create_slots_struct(raw_cls: type, cls_config: dict):
+def create_slots_struct(
+    raw_cls: type, cls_config: dict, extra_slots: tuple[str, ...] = ()
+):
     # create a dataclass with slots being False
     cls_config.update(slots=False)
-    cls_ = _process_class(raw_cls, **cls_config)
+    with struct_codegen():
+        cls_ = _process_class(raw_cls, **cls_config)
+    set_schema(cls_, build_schema(cls_, frozen=cls_config["frozen"]))
 
     # create another dataclass with slots using previous dataclass
     slot_dtc = _add_slots(
-        cls_, is_frozen=cls_config["frozen"], weakref_slot=cls_config["weakref_slot"]
+        cls_,
+        is_frozen=cls_config["frozen"],
+        weakref_slot=cls_config["weakref_slot"],
+        extra_slots=extra_slots,
     )
 
     # return the new class with slots
@@ -0,0 +1,122 @@
+"""
+on-disk snapshots of parsed configs.
+
+`load_config` reads a config source file, parses it into a `ConfigBase` tree
+and stores the result in a snapshot file, by default
+`__pycache__/<source name>.<config class>.snapshot` next to the source.
+later loads memory map the snapshot and rebuild the frozen instances directly
+from their pickled field values, skipping the loader, coercion and `__init__`.
+
+snapshots are keyed by a hash of the source bytes and of the config schema,
+nested configs included, a snapshot whose key does not match is rebuilt.
+
+    config = load_config(AppConfig, "settings.toml")
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import tomllib
+import typing as ty
+
+from .schema import schema_fingerprint
+
+T = ty.TypeVar("T")
+Loader = ty.Callable[[bytes], ty.Mapping[str, ty.Any]]
+
+SNAPSHOT_SUFFIX = ".snapshot"
+_MAGIC = b"BZSNAP01"
+_KEY_SIZE = hashlib.sha256().digest_size
+_HEADER_SIZE = len(_MAGIC) + _KEY_SIZE
+
+
+def _load_toml(data: bytes) -> ty.Mapping[str, ty.Any]:
+    return tomllib.loads(data.decode())
+
+
+LOADERS: dict[str, Loader] = {
+    ".json": json.loads,
+    ".toml": _load_toml,
+}
+
+
+def snapshot_path(cls: type, source: str | os.PathLike) -> str:
+    "settings.toml -> __pycache__/settings.toml.AppConfig.snapshot"
+    directory, name = os.path.split(os.fspath(source))
+    filename = f"{name}.{cls.__qualname__}{SNAPSHOT_SUFFIX}"
+    return os.path.join(directory, "__pycache__", filename)
+
+
+def snapshot_key(cls: type, source_data: bytes) -> bytes:
+    "digest of the source bytes and the schema fingerprint of cls"
+    digest = hashlib.sha256(source_data)
+    digest.update(schema_fingerprint(cls).encode())
+    digest.update(str(pickle.HIGHEST_PROTOCOL).encode())
+    return digest.digest()
+
+
+def read_snapshot(path: str, key: bytes) -> ty.Any | None:
+    "return the object stored under key, None if missing, stale or unreadable"
+    try:
+        with open(path, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            if mm[:_HEADER_SIZE] != _MAGIC + key:
+                return None
+            with memoryview(mm)[_HEADER_SIZE:] as body:
+                return pickle.loads(body)
+    except Exception:
+        # empty or truncated file, or classes moved since the snapshot,
+        # any failure means the source is parsed again
+        return None
+
+
+def write_snapshot(path: str, key: bytes, obj: ty.Any) -> bool:
+    "store obj under key, return False if obj or the file can not be written"
+    try:
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp_path, "wb") as file:
+            file.write(_MAGIC + key)
+            file.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        return False
+    return True
+
+
+def load_config(
+    cls: type[T],
+    source: str | os.PathLike,
+    *,
+    loader: Loader | None = None,
+    snapshot: str | os.PathLike | None = None,
+) -> T:
+    """
+    parse the config file at source into cls through a snapshot.
+    loader turns the source bytes into a mapping, picked by file suffix
+    for json and toml sources.
+    """
+    if loader is None:
+        suffix = os.path.splitext(source)[1].lower()
+        if (loader := LOADERS.get(suffix)) is None:
+            raise ValueError(f"no loader for {suffix!r} config files, pass one")
+
+    with open(source, "rb") as file:
+        source_data = file.read()
+
+    path = os.fspath(snapshot) if snapshot is not None else snapshot_path(cls, source)
+    key = snapshot_key(cls, source_data)
+    if (config := read_snapshot(path, key)) is not None and type(config) is cls:
+        return config
+
+    config = cls.parse(loader(source_data))  # type: ignore
+    write_snapshot(path, key, config)
+    return config
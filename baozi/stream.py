@@ -0,0 +1,204 @@
+"""
+streaming readers building structs from NDJSON and CSV sources.
+
+records are decoded one line at a time by a decoder compiled once per class,
+see `typecast.make_decoder`, so memory stays bounded by `chunk_size`
+no matter how large the source is.
+
+    for user in iter_ndjson(User, "users.ndjson"):
+        ...
+
+    for chunk in iter_csv(User, "users.csv", chunk_size=10_000, workers=4):
+        ...
+
+with `workers`, the file is split into blocks aligned to line boundaries
+and decoded by a process pool, struct classes must be importable by workers.
+CSV files read in parallel must not contain line breaks inside quoted values.
+"""
+
+import csv
+import json
+import mmap
+import os
+import typing as ty
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
+
+from .typecast import make_decoder, make_row_decoder
+
+T = ty.TypeVar("T")
+Source = ty.Union[str, os.PathLike, ty.IO]
+
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+def _is_path(source) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+@contextmanager
+def _open_lines(source: Source, use_mmap: bool) -> ty.Iterator[ty.Iterator]:
+    if not _is_path(source):
+        yield iter(source)  # type: ignore
+        return
+
+    with open(source, "rb") as file:
+        if not use_mmap:
+            yield iter(file)
+        elif os.fstat(file.fileno()).st_size == 0:
+            yield iter(())
+        else:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield iter(mm.readline, b"")
+
+
+def _read_range(path, start: int, end: int) -> ty.Iterator[bytes]:
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        mm.seek(start)
+        while mm.tell() < end:
+            yield mm.readline()
+
+
+def _text_lines(lines: ty.Iterable, encoding: str) -> ty.Iterator[str]:
+    for line in lines:
+        yield line.decode(encoding) if isinstance(line, bytes) else line
+
+
+def chunked(items: ty.Iterable[T], size: int) -> ty.Iterator[list[T]]:
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+def _decode_ndjson(cls: type, lines: ty.Iterable) -> ty.Iterator:
+    decode = make_decoder(cls)
+    loads = json.loads
+    for line in lines:
+        if line.strip():
+            yield decode(loads(line))
+
+
+def _decode_csv(cls: type, columns: list[str], lines: ty.Iterable[str], fmtparams: dict):
+    decode = make_row_decoder(cls, columns)
+    for row in csv.reader(lines, **fmtparams):
+        if row:
+            yield decode(row)
+
+
+def _ndjson_block(cls: type, path, start: int, end: int) -> list:
+    return list(_decode_ndjson(cls, _read_range(path, start, end)))
+
+
+def _csv_block(
+    cls: type, path, start: int, end: int, columns: list[str], encoding: str, fmtparams: dict
+) -> list:
+    lines = _text_lines(_read_range(path, start, end), encoding)
+    return list(_decode_csv(cls, columns, lines, fmtparams))
+
+
+def _split_blocks(path, start: int, block_size: int) -> ty.Iterator[tuple[int, int]]:
+    size = os.path.getsize(path)
+    with open(path, "rb") as file:
+        while start < size:
+            file.seek(min(start + block_size, size))
+            file.readline()
+            end = file.tell()
+            yield start, end
+            start = end
+
+
+def _parallel(
+    task: ty.Callable, blocks: ty.Iterable[tuple], workers: int
+) -> ty.Iterator:
+    "run task over blocks in order, at most 2 * workers blocks are in flight"
+    # imported here, multiprocessing is costly to import and workers are opt-in
+    from concurrent.futures import ProcessPoolExecutor
+
+    pool = ProcessPoolExecutor(workers)
+    try:
+        pending: deque = deque()
+        for block in blocks:
+            pending.append(pool.submit(task, *block))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _output(records: ty.Iterator, chunk_size: int | None):
+    return chunked(records, chunk_size) if chunk_size else records
+
+
+def iter_ndjson(
+    cls: type[T],
+    source: Source,
+    *,
+    chunk_size: int | None = None,
+    use_mmap: bool = False,
+    workers: int | None = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> ty.Iterator[T] | ty.Iterator[list[T]]:
+    """
+    yield instances of cls from a NDJSON source, a path or a file object,
+    or lists of at most `chunk_size` instances.
+    """
+    if workers:
+        if not _is_path(source):
+            raise TypeError("parallel mode requires a file path")
+        blocks = ((cls, source, start, end) for start, end in _split_blocks(source, 0, block_size))
+        return _output(_parallel(_ndjson_block, blocks, workers), chunk_size)
+
+    def records():
+        with _open_lines(source, use_mmap) as lines:
+            yield from _decode_ndjson(cls, lines)
+
+    return _output(records(), chunk_size)
+
+
+def _read_header(path, encoding: str, fmtparams: dict) -> tuple[list[str], int]:
+    with open(path, "rb") as file:
+        header = file.readline()
+        offset = file.tell()
+    columns = next(csv.reader([header.decode(encoding)], **fmtparams), [])
+    return columns, offset
+
+
+def iter_csv(
+    cls: type[T],
+    source: Source,
+    *,
+    chunk_size: int | None = None,
+    use_mmap: bool = False,
+    workers: int | None = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    encoding: str = "utf-8",
+    **fmtparams,
+) -> ty.Iterator[T] | ty.Iterator[list[T]]:
+    """
+    yield instances of cls from a CSV source with a header row,
+    columns are matched to fields by name, extra columns are ignored.
+    `fmtparams` are passed to `csv.reader`.
+    """
+    if workers:
+        if not _is_path(source):
+            raise TypeError("parallel mode requires a file path")
+        columns, offset = _read_header(source, encoding, fmtparams)
+        blocks = (
+            (cls, source, start, end, columns, encoding, fmtparams)
+            for start, end in _split_blocks(source, offset, block_size)
+        )
+        return _output(_parallel(_csv_block, blocks, workers), chunk_size)
+
+    def records():
+        with _open_lines(source, use_mmap) as lines:
+            text = _text_lines(lines, encoding)
+            if (header := next(csv.reader(text, **fmtparams), None)) is None:
+                return
+            yield from _decode_csv(cls, header, text, fmtparams)
+
+    return _output(records(), chunk_size)
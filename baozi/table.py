@@ -0,0 +1,283 @@
+"""
+read-only struct tables in memory mapped files.
+
+`write_table` packs instances of a struct class into a fixed-layout file,
+one row per instance, laid out from the class annotations:
+
+    int -> q, float -> d, bool -> ?, str / bytes -> q offset + q length into a heap
+
+strings and bytes are stored once in a heap after the rows, repeated values are shared.
+the header holds a magic number, a fingerprint of the layout, the row count and sizes.
+
+`StructTable` opens the file with mmap and serves rows as instances built on access,
+or as views reading single fields from the mapped pages, so processes opening
+the same table share one page cache copy.
+
+    write_table("cities.tbl", City, cities)
+    with StructTable("cities.tbl", City) as table:
+        table[3].name, table.view(3).name
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import typing as ty
+from collections.abc import Sequence
+
+from .codegen import create_fn, module_globals, set_qualname
+from .error import UnsupportedFieldTypeError
+from .schema import get_schema
+from .slots import FROM_VALUES
+
+T = ty.TypeVar("T")
+
+_MAGIC = b"BZTABLE1"
+# magic, layout fingerprint, row count, row size, heap offset
+_HEADER = struct.Struct("<8s32sQQQ")
+
+FIELD_CODES: dict[type, str] = {
+    int: "q",
+    float: "d",
+    bool: "?",
+    str: "qq",
+    bytes: "qq",
+}
+
+
+class TableLayout(ty.NamedTuple):
+    names: tuple[str, ...]
+    types: tuple[type, ...]
+    row: struct.Struct
+    # position of each field in the unpacked row tuple
+    columns: tuple[int, ...]
+    fingerprint: bytes
+
+
+def table_layout(cls: type) -> TableLayout:
+    schema = get_schema(cls)
+    if schema is None:
+        raise TypeError(f"{cls.__name__} is not a struct class")
+
+    fmt, columns, types = "<", [], []
+    for info in schema.fields:
+        field_type = info.type
+        if not isinstance(field_type, type) or field_type not in FIELD_CODES:
+            raise UnsupportedFieldTypeError(info.name, field_type)
+        columns.append(len(fmt) - 1)
+        fmt += FIELD_CODES[field_type]
+        types.append(field_type)
+
+    description = ";".join(
+        f"{name}:{FIELD_CODES[tp]}:{tp.__name__}"
+        for name, tp in zip(schema.field_names, types)
+    )
+    return TableLayout(
+        names=schema.field_names,
+        types=tuple(types),
+        row=struct.Struct(fmt),
+        columns=tuple(columns),
+        fingerprint=hashlib.sha256(description.encode()).digest(),
+    )
+
+
+def write_table(path: str | os.PathLike, cls: type[T], records: ty.Iterable[T]) -> int:
+    "write records of cls into a table file at path, return the row count"
+    layout = table_layout(cls)
+    pack = layout.row.pack
+    getters = [
+        (name, tp in (str, bytes), tp is str)
+        for name, tp in zip(layout.names, layout.types)
+    ]
+
+    rows = bytearray()
+    heap = bytearray()
+    heap_offsets: dict[ty.Any, int] = {}
+    count = 0
+    for record in records:
+        if type(record) is not cls:
+            raise TypeError(f"{record!r} is not an instance of {cls.__name__}")
+        values = []
+        for name, in_heap, is_str in getters:
+            value = getattr(record, name)
+            if not in_heap:
+                values.append(value)
+                continue
+
+            data = value.encode() if is_str else bytes(value)
+            if (offset := heap_offsets.get(data)) is None:
+                offset = heap_offsets[data] = len(heap)
+                heap += data
+            values.extend((offset, len(data)))
+        rows += pack(*values)
+        count += 1
+
+    heap_offset = _HEADER.size + len(rows)
+    header = _HEADER.pack(
+        _MAGIC, layout.fingerprint, count, layout.row.size, heap_offset
+    )
+
+    path = os.fspath(path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(header)
+        file.write(rows)
+        file.write(heap)
+    os.replace(tmp_path, path)
+    return count
+
+
+def _make_row_values(cls: type, layout: TableLayout, heap_offset: int):
+    "generate a function reading field values of the row at a file position"
+    locals: dict[str, ty.Any] = dict(_unpack=layout.row.unpack_from, _heap=heap_offset)
+    targets, values = [], []
+    for i, (name, tp) in enumerate(zip(layout.names, layout.types)):
+        if tp is str or tp is bytes:
+            targets.extend([f"_o{i}", f"_n{i}"])
+            value = f"buf[_heap + _o{i}:_heap + _o{i} + _n{i}]"
+            values.append(f"{value}.decode()" if tp is str else value)
+        else:
+            targets.append(f"_v{i}")
+            values.append(f"_v{i}")
+
+    body = []
+    if targets:
+        body.append(f"{', '.join(targets)}, = _unpack(buf, pos)")
+    body.append(f"return ({', '.join(values)}{',' if len(values) == 1 else ''})")
+    fn = create_fn(
+        "row_values", ("buf", "pos"), body, globals=module_globals(cls), locals=locals
+    )
+    return set_qualname(cls, fn)
+
+
+def _field_reader(layout: TableLayout, index: int, heap_offset: int):
+    "read a single field of the row at a file position"
+    tp = layout.types[index]
+    offset = struct.calcsize(layout.row.format[: layout.columns[index] + 1])
+    if tp is str or tp is bytes:
+        unpack = struct.Struct("<qq").unpack_from
+        decode = tp is str
+
+        def read_heap(buf, pos):
+            start, size = unpack(buf, pos + offset)
+            data = buf[heap_offset + start : heap_offset + start + size]
+            return data.decode() if decode else data
+
+        return read_heap
+
+    unpack_value = struct.Struct("<" + FIELD_CODES[tp]).unpack_from
+    return lambda buf, pos: unpack_value(buf, pos + offset)[0]
+
+
+class RowView:
+    """
+    read-only attribute view over a row of a StructTable,
+    each attribute access reads the field from the mapped file.
+    """
+
+    __slots__ = ("_table", "_pos")
+
+    def __init__(self, table: "StructTable", pos: int):
+        self._table = table
+        self._pos = pos
+
+    def __repr__(self) -> str:
+        names = self._table.layout.names
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in names)
+        return f"{self.__class__.__qualname__}({fields})"
+
+
+def _make_view_type(cls: type, layout: TableLayout, heap_offset: int) -> type[RowView]:
+    namespace: dict[str, ty.Any] = dict(
+        __slots__=(),
+        __module__=cls.__module__,
+        __qualname__=f"{cls.__qualname__}Row",
+    )
+    for i, name in enumerate(layout.names):
+        read = _field_reader(layout, i, heap_offset)
+        namespace[name] = property(
+            lambda self, read=read: read(self._table._buf, self._pos)
+        )
+    return type(f"{cls.__name__}Row", (RowView,), namespace)
+
+
+class StructTable(Sequence[T]):
+    """
+    read-only sequence over a table file written by `write_table`,
+    instances are built from the mapped rows on access, without calling `__init__`.
+    raises ValueError when the file was not written for the layout of cls.
+    """
+
+    def __init__(self, path: str | os.PathLike, cls: type[T]):
+        self.layout = layout = table_layout(cls)
+        self._cls = cls
+
+        with open(path, "rb") as file:
+            try:
+                self._buf = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"{os.fspath(path)} is not a struct table") from None
+
+        if len(self._buf) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{os.fspath(path)} is not a struct table")
+        header = _HEADER.unpack_from(self._buf)
+        magic, fingerprint, count, row_size, heap_offset = header
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{os.fspath(path)} is not a struct table")
+        if fingerprint != layout.fingerprint or row_size != layout.row.size:
+            self.close()
+            raise ValueError(f"{os.fspath(path)} was not written for {cls.__name__}")
+
+        self._count = count
+        self._row_size = row_size
+        self._row_values = _make_row_values(cls, layout, heap_offset)
+        self._view_type = _make_view_type(cls, layout, heap_offset)
+
+        from_values = getattr(cls, FROM_VALUES, None)
+        if from_values is None:
+            names = layout.names
+            from_values = lambda values: cls(**dict(zip(names, values)))  # type: ignore
+        self._from_values = from_values
+
+    def _position(self, index: int) -> int:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("table index out of range")
+        return _HEADER.size + index * self._row_size
+
+    def __len__(self) -> int:
+        return self._count
+
+    @ty.overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @ty.overload
+    def __getitem__(self, index: slice) -> list[T]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        return self._from_values(self._row_values(self._buf, self._position(index)))
+
+    def __iter__(self) -> ty.Iterator[T]:
+        buf, row_values, from_values = self._buf, self._row_values, self._from_values
+        pos = _HEADER.size
+        for _ in range(self._count):
+            yield from_values(row_values(buf, pos))
+            pos += self._row_size
+
+    def view(self, index: int) -> RowView:
+        "attribute view over a row, reading fields only when accessed"
+        return self._view_type(self, self._position(index))
+
+    def close(self) -> None:
+        self._buf.close()
+
+    def __enter__(self) -> "StructTable[T]":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,255 @@
+"""
+frozen twins of mutable structs, and mutable twins of frozen ones.
+
+with `twin=True`, StructMeta generates the counterpart class of a struct,
+available as `Cls.Frozen` for a mutable struct and `Cls.Mutable` for a frozen one.
+field types are translated, list -> tuple, set -> frozenset, dict -> PMap
+and nested structs to their twins, the frozen twin passes the immutability check
+once at class creation.
+
+`freeze` and `thaw` copy field values straight into a new instance of the twin,
+converting containers on the way, without calling `__init__`.
+
+class Order(Struct, twin=True):
+    items: list[str]
+
+frozen = freeze(Order(items=["a"]))
+assert frozen == Order.Frozen(items=("a",))
+"""
+
+import types
+import typing as ty
+from dataclasses import MISSING, field
+
+from .codegen import create_fn, module_globals, set_qualname
+from .persistent import PMap, PVector
+from .schema import FieldInfo, get_schema
+
+FROZEN_TWIN = "Frozen"
+MUTABLE_TWIN = "Mutable"
+CONVERT_FN = "__BAOZI_TWIN_CONVERT__"
+
+Converter = ty.Callable[[ty.Any], ty.Any] | None
+Translated = tuple[ty.Any, Converter, Converter]
+_UNION_TYPES = (ty.Union, types.UnionType)
+
+
+def _map(container: type, conv: Converter) -> ty.Callable:
+    if conv is None:
+        return container
+    return lambda values: container(map(conv, values))
+
+
+def _map_values(container: type, conv: Converter) -> ty.Callable:
+    if conv is None:
+        return container
+    return lambda mapping: container((k, conv(v)) for k, v in mapping.items())
+
+
+def _union_converter(pairs: list[tuple[type, ty.Callable]], optional: bool) -> Converter:
+    "convert union values by their runtime type"
+    if not pairs:
+        return None
+    if optional and len(pairs) == 1:
+        conv = pairs[0][1]
+        return lambda value: None if value is None else conv(value)
+
+    def convert(value):
+        for runtime_type, conv in pairs:
+            if isinstance(value, runtime_type):
+                return conv(value)
+        return value
+
+    return convert
+
+
+def _translate_union(args: tuple, translate) -> Translated:
+    translated = [(arg, *translate(arg)) for arg in args]
+    new_type = ty.Union[tuple(t for _, t, _, _ in translated)]  # type: ignore
+    optional = len(args) == 2 and type(None) in args
+    to_twin = [(ty.get_origin(a) or a, f) for a, _, f, _ in translated if f is not None]
+    from_twin = [(ty.get_origin(t) or t, b) for _, t, _, b in translated if b is not None]
+    return (
+        new_type,
+        _union_converter(to_twin, optional),
+        _union_converter(from_twin, optional),
+    )
+
+
+def _struct_twin(tp, attr: str) -> Translated | None:
+    if isinstance(tp, type) and attr in tp.__dict__:
+        twin = tp.__dict__[attr]
+        return twin, tp.__dict__[CONVERT_FN], twin.__dict__[CONVERT_FN]
+    return None
+
+
+def freeze_type(tp) -> Translated:
+    """
+    immutable counterpart of a mutable field type,
+    with converters of values to and from it, None where values are kept as is.
+    """
+    if tp is list:
+        return tuple, tuple, list
+    if tp is set:
+        return frozenset, frozenset, set
+    if tp is dict:
+        return PMap, PMap, dict
+
+    origin, args = ty.get_origin(tp), ty.get_args(tp)
+    if origin is list and args:
+        inner, fwd, back = freeze_type(args[0])
+        return tuple[inner, ...], _map(tuple, fwd), _map(list, back)
+    if origin is set and args:
+        inner, fwd, back = freeze_type(args[0])
+        return frozenset[inner], _map(frozenset, fwd), _map(set, back)
+    if origin is dict and args:
+        inner, fwd, back = freeze_type(args[1])
+        return PMap[args[0], inner], _map_values(PMap, fwd), _map_values(dict, back)
+    if origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        inner, fwd, back = freeze_type(args[0])
+        if fwd is None:
+            return tp, None, None
+        return tuple[inner, ...], _map(tuple, fwd), _map(tuple, back)
+    if origin in _UNION_TYPES:
+        return _translate_union(args, freeze_type)
+
+    return _struct_twin(tp, FROZEN_TWIN) or (tp, None, None)
+
+
+def thaw_type(tp) -> Translated:
+    """
+    mutable counterpart of an immutable field type,
+    with converters of values to and from it, None where values are kept as is.
+    """
+    if tp is frozenset:
+        return set, set, frozenset
+    if tp is PMap:
+        return dict, dict, PMap
+    if tp is PVector:
+        return list, list, PVector
+
+    origin, args = ty.get_origin(tp), ty.get_args(tp)
+    if origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        inner, fwd, back = thaw_type(args[0])
+        return list[inner], _map(list, fwd), _map(tuple, back)
+    if origin is PVector and args:
+        inner, fwd, back = thaw_type(args[0])
+        return list[inner], _map(list, fwd), _map(PVector, back)
+    if origin is frozenset and args:
+        inner, fwd, back = thaw_type(args[0])
+        return set[inner], _map(set, fwd), _map(frozenset, back)
+    if origin is PMap and args:
+        inner, fwd, back = thaw_type(args[1])
+        return dict[args[0], inner], _map_values(dict, fwd), _map_values(PMap, back)
+    if origin in _UNION_TYPES:
+        return _translate_union(args, thaw_type)
+
+    return _struct_twin(tp, MUTABLE_TWIN) or (tp, None, None)
+
+
+def _make_convert(cls: type, twin: type, converters: dict[str, Converter]):
+    "copy fields of a cls instance into a new twin instance, bypassing __init__"
+    locals: dict[str, ty.Any] = dict(_twin=twin, _new=object.__new__)
+    body = ["new = _new(_twin)"]
+    setters = {
+        name: getattr(twin, name, None).__set__  # type: ignore
+        for name in converters
+        if isinstance(getattr(twin, name, None), types.MemberDescriptorType)
+    }
+    if len(setters) < len(converters):
+        body.append("attrs = new.__dict__")
+
+    for i, (name, conv) in enumerate(converters.items()):
+        value = f"obj.{name}"
+        if conv is not None:
+            locals[f"_conv_{i}"] = conv
+            value = f"_conv_{i}({value})"
+
+        if name in setters:
+            locals[f"_set_{i}"] = setters[name]
+            body.append(f"_set_{i}(new, {value})")
+        else:
+            body.append(f"attrs[{name!r}] = {value}")
+
+    body.append("return new")
+    fn = create_fn(
+        "convert", ("obj",), body, globals=module_globals(cls), locals=locals
+    )
+    return set_qualname(cls, fn)
+
+
+def _twin_default(info: FieldInfo, conv: Converter) -> dict[str, ty.Any]:
+    if info.default is not MISSING:
+        if conv is None or info.default is None:
+            return dict(default=info.default)
+        default = info.default
+        # converted to a mutable container for a mutable twin, built per instance
+        return dict(default_factory=lambda: conv(default))
+    if info.default_factory is not MISSING:
+        factory = info.default_factory
+        if conv is None:
+            return dict(default_factory=factory)
+        return dict(default_factory=lambda: conv(factory()))
+    return {}
+
+
+def make_twin(cls: type, base: type, **configs) -> type:
+    """
+    create the twin of a struct class, derived from base and named `Frozen`
+    for a mutable cls or `Mutable` for a frozen one, set as an attribute of cls,
+    and install the conversion functions both ways.
+    """
+    schema = get_schema(cls)
+    if schema is None:
+        raise TypeError(f"{cls.__name__} is not a struct class")
+
+    if schema.frozen:
+        translate, attr, back_attr = thaw_type, MUTABLE_TWIN, FROZEN_TWIN
+    else:
+        translate, attr, back_attr = freeze_type, FROZEN_TWIN, MUTABLE_TWIN
+
+    annotations: dict[str, ty.Any] = {}
+    namespace: dict[str, ty.Any] = {}
+    to_twin: dict[str, Converter] = {}
+    from_twin: dict[str, Converter] = {}
+    for info in schema.fields:
+        twin_type, to_twin[info.name], from_twin[info.name] = translate(info.type)
+        annotations[info.name] = twin_type
+        namespace[info.name] = field(
+            init=info.init,
+            compare=info.compare,
+            **_twin_default(info, to_twin[info.name]),
+        )
+
+    namespace.update(
+        __annotations__=annotations,
+        __module__=cls.__module__,
+        __qualname__=f"{cls.__qualname__}.{attr}",
+    )
+    twin = type(cls)(attr, (base,), namespace, twin=False, **configs)
+
+    setattr(cls, attr, twin)
+    setattr(twin, back_attr, cls)
+    setattr(cls, CONVERT_FN, staticmethod(_make_convert(cls, twin, to_twin)))
+    setattr(twin, CONVERT_FN, staticmethod(_make_convert(twin, cls, from_twin)))
+    return twin
+
+
+def freeze(obj: ty.Any) -> ty.Any:
+    "frozen twin of a mutable struct instance, frozen instances are returned as is"
+    cls = type(obj)
+    if FROZEN_TWIN in cls.__dict__:
+        return cls.__dict__[CONVERT_FN](obj)
+    if (schema := get_schema(cls)) is not None and schema.frozen:
+        return obj
+    raise TypeError(f"{cls.__name__} has no frozen twin, define it with twin=True")
+
+
+def thaw(obj: ty.Any) -> ty.Any:
+    "mutable twin of a frozen struct instance, mutable instances are returned as is"
+    cls = type(obj)
+    if MUTABLE_TWIN in cls.__dict__:
+        return cls.__dict__[CONVERT_FN](obj)
+    if (schema := get_schema(cls)) is not None and not schema.frozen:
+        return obj
+    raise TypeError(f"{cls.__name__} has no mutable twin, define it with twin=True")
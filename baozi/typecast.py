@@ -1,6 +1,15 @@
+import types
 import typing as ty
+from dataclasses import MISSING
 from pathlib import Path
 
+from .codegen import create_fn, module_globals, set_qualname
+from .schema import get_schema, is_resolved, resolve_schema
+
+DECODER = "__BAOZI_DECODER__"
+_TRUE_STRINGS = frozenset({"true", "yes", "y", "on", "1"})
+_FALSE_STRINGS = frozenset({"false", "no", "n", "off", "0", ""})
+
 
 class Dataclass(ty.Protocol):
     __dataclass_fields__: ty.ClassVar[dict]
@@ -23,13 +32,25 @@ class ValueNotFoundError(Exception):
         return f"Value {self.missed_val} is not found"
 
 
-def parse_config(config: object, values: ty.Mapping[str, ty.Any]) -> dict:
+def _read_converters(config: object) -> ty.Mapping[str, ty.Callable]:
+    if schema := resolve_schema(config):  # type: ignore
+        if is_resolved(schema):
+            return schema.converters
+
     ori_attrs: dict[str, type] = ty.get_type_hints(config)
-    attrs = {
+    return {
         attr_name: attr_type
         for attr_name, attr_type in ori_attrs.items()
         if not ty.get_origin(attr_type) == ty.ClassVar
     }
+
+
+def _is_struct_type(attr_type) -> bool:
+    return isinstance(attr_type, type) and get_schema(attr_type) is not None
+
+
+def parse_config(config: object, values: ty.Mapping[str, ty.Any]) -> dict:
+    attrs = _read_converters(config)
     if not attrs:
         return {}
 
@@ -40,7 +61,202 @@ def parse_config(config: object, values: ty.Mapping[str, ty.Any]) -> dict:
             #     continue
             raise ValueNotFoundError(attr_name)
         try:
-            config_dict[attr_name] = attr_type(val)
+            if isinstance(val, ty.Mapping) and _is_struct_type(attr_type):
+                # nested config sections
+                config_dict[attr_name] = attr_type(**parse_config(attr_type, val))
+            else:
+                config_dict[attr_name] = attr_type(val)
         except ValueError as ve:
             raise TypeCoerceError(attr_name, attr_type)
     return config_dict
+
+
+def _str_to_bool(val) -> bool:
+    if isinstance(val, str):
+        if (lowered := val.strip().lower()) in _TRUE_STRINGS:
+            return True
+        if lowered in _FALSE_STRINGS:
+            return False
+        raise ValueError(val)
+    return bool(val)
+
+
+_UNION_TYPES = (ty.Union, types.UnionType)
+_ARRAY_TYPES = (tuple, list, set, frozenset)
+
+
+def _plain_converter(tp: type) -> ty.Callable[[ty.Any], ty.Any]:
+    if tp is bool:
+        return _str_to_bool
+    if get_schema(tp) is not None:
+        return make_decoder(tp)
+    return tp
+
+
+def _value_converter(tp: ty.Any) -> ty.Callable[[ty.Any], ty.Any] | None:
+    """
+    converter of a raw value into tp, None when values are passed as is.
+    unions try their member types in order, containers convert their elements.
+    """
+    if isinstance(tp, type) and not ty.get_args(tp):
+        conv = _plain_converter(tp)
+        return lambda value: value if type(value) is tp else conv(value)
+
+    origin, args = ty.get_origin(tp), ty.get_args(tp)
+    if origin in _UNION_TYPES:
+        members = [arg for arg in args if arg is not type(None)]
+        nullable = len(members) < len(args)
+        member_types = tuple(ty.get_origin(arg) or arg for arg in members)
+        convs = [conv for arg in members if (conv := _value_converter(arg))]
+
+        def convert_union(value):
+            if value is None and nullable:
+                return None
+            if type(value) in member_types:
+                return value
+            for conv in convs:
+                try:
+                    return conv(value)
+                except (ValueError, TypeError, AttributeError):
+                    continue
+            if convs:
+                raise ValueError(value)
+            return value
+
+        return convert_union
+
+    if origin in _ARRAY_TYPES:
+        if origin is tuple and args and args[-1] is not Ellipsis:
+            item_convs = [_value_converter(arg) for arg in args]
+        else:
+            item_convs = None
+            item_conv = _value_converter(args[0]) if args else None
+
+        def convert_array(value):
+            # a string is a single value, not a sequence of characters
+            if isinstance(value, (str, bytes)) or not isinstance(value, ty.Iterable):
+                raise TypeError(value)
+            if item_convs is not None:
+                items = list(value)
+                if len(items) != len(item_convs):
+                    raise ValueError(value)
+                return origin(c(v) if c else v for c, v in zip(item_convs, items))
+            if item_conv is None:
+                return origin(value)
+            return origin(item_conv(item) for item in value)
+
+        return convert_array
+
+    if origin is dict and args:
+        value_conv = _value_converter(args[1])
+
+        def convert_dict(value):
+            if not isinstance(value, ty.Mapping):
+                raise TypeError(value)
+            if value_conv is None:
+                return dict(value)
+            return {k: value_conv(v) for k, v in value.items()}
+
+        return convert_dict
+    return None
+
+
+def _make_decoder(
+    cls: type,
+    name: str,
+    arg: str,
+    access: ty.Callable[[str], str | None],
+    prelude: ty.Sequence[str] = (),
+    empty_missing: bool = False,
+):
+    schema = resolve_schema(cls)
+    if schema is None:
+        raise TypeError(f"{cls.__name__} is not a struct class")
+
+    locals: dict[str, ty.Any] = dict(
+        _cls=cls,
+        _not_found=ValueNotFoundError,
+        _coerce_error=TypeCoerceError,
+    )
+    body = list(prelude)
+    kwargs = []
+    for i, field in enumerate(schema.fields):
+        if not field.init:
+            continue
+        var = f"_v_{i}"
+        kwargs.append(f"{field.name}={var}")
+
+        if (expr := access(field.name)) is None:
+            missing = [f"{var} = None"]
+        else:
+            missing = [f"{var} = {expr}"]
+        body.extend(missing)
+
+        if empty_missing:
+            body.append(f"if {var} is None or {var} == '':")
+        else:
+            body.append(f"if {var} is None:")
+        if field.default is not MISSING:
+            locals[f"_dflt_{i}"] = field.default
+            body.append(f"  {var} = _dflt_{i}")
+        elif field.default_factory is not MISSING:
+            locals[f"_factory_{i}"] = field.default_factory
+            body.append(f"  {var} = _factory_{i}()")
+        else:
+            body.append(f"  raise _not_found({field.name!r})")
+
+        converter = field.converter
+        locals[f"_type_{i}"] = converter
+        if isinstance(converter, type) and not ty.get_args(converter):
+            # plain classes are checked inline, the common case
+            locals[f"_conv_{i}"] = _plain_converter(converter)
+            body.append(f"elif type({var}) is not _type_{i}:")
+        elif (conv := _value_converter(converter)) is not None:
+            locals[f"_conv_{i}"] = conv
+            body.append("else:")
+        else:
+            # typing constructs such as Any or Literal, passed as is
+            continue
+
+        body.extend(
+            [
+                "  try:",
+                f"    {var} = _conv_{i}({var})",
+                "  except (ValueError, TypeError, AttributeError):",
+                f"    raise _coerce_error({field.name!r}, _type_{i}) from None",
+            ]
+        )
+
+    body.append(f"return _cls({', '.join(kwargs)})")
+    fn = create_fn(name, (arg,), body, globals=module_globals(cls), locals=locals)
+    return set_qualname(cls, fn)
+
+
+def make_decoder(cls: type) -> ty.Callable[[ty.Mapping[str, ty.Any]], ty.Any]:
+    """
+    compiled decoder building an instance of cls from a mapping,
+    values are coerced into field types, missing values fall back to field defaults.
+    the decoder is generated once per class.
+    """
+    if (decoder := cls.__dict__.get(DECODER)) is None:
+        decoder = _make_decoder(cls, "decode", "row", lambda name: f"row.get({name!r})")
+        setattr(cls, DECODER, staticmethod(decoder))
+    return decoder
+
+
+def make_row_decoder(
+    cls: type, columns: ty.Sequence[str]
+) -> ty.Callable[[ty.Sequence[ty.Any]], ty.Any]:
+    "compiled decoder building an instance of cls from a row of values ordered as columns"
+    positions = {column: pos for pos, column in enumerate(columns)}
+
+    def access(name: str) -> str | None:
+        if (pos := positions.get(name)) is None:
+            return None
+        # short rows miss their trailing cells
+        return f"row[{pos}] if {pos} < _size else None"
+
+    # empty cells are missing values
+    return _make_decoder(
+        cls, "decode_row", "row", access, prelude=["_size = len(row)"], empty_missing=True
+    )
@@ -0,0 +1,88 @@
+import typing as ty
+from collections.abc import ItemsView, Mapping, ValuesView
+
+from .schema import StructSchema, get_schema, values_getter
+
+VIEW_TYPE = "__BAOZI_VIEW_TYPE__"
+
+
+class StructView(Mapping[str, ty.Any]):
+    """
+    read-only mapping over fields of a struct instance,
+    values are read from the instance on access, nothing is copied.
+    """
+
+    __slots__ = ("_obj",)
+
+    _names: ty.ClassVar[tuple[str, ...]] = ()
+    _fieldset: ty.ClassVar[frozenset[str]] = frozenset()
+    _values: ty.ClassVar[ty.Callable[[ty.Any], tuple]] = staticmethod(lambda obj: ())
+
+    def __init__(self, obj):
+        self._obj = obj
+
+    def __getitem__(self, key: str):
+        if key in self._fieldset:
+            return getattr(self._obj, key)
+        raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._fieldset
+
+    def __iter__(self) -> ty.Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def values(self) -> ValuesView:
+        return _StructValues(self)
+
+    def items(self) -> ItemsView:
+        return _StructItems(self)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._obj!r})"
+
+
+class _StructValues(ValuesView):
+    def __iter__(self):
+        view: StructView = self._mapping  # type: ignore
+        return iter(view._values(view._obj))
+
+
+class _StructItems(ItemsView):
+    def __iter__(self):
+        view: StructView = self._mapping  # type: ignore
+        return zip(view._names, view._values(view._obj))
+
+
+def make_view_type(cls: type, schema: StructSchema) -> type[StructView]:
+    names = schema.field_names
+    namespace = dict(
+        __slots__=(),
+        __module__=cls.__module__,
+        __qualname__=f"{cls.__qualname__}View",
+        _names=names,
+        _fieldset=frozenset(names),
+        _values=staticmethod(values_getter(names)),
+    )
+    return type(f"{cls.__name__}View", (StructView,), namespace)
+
+
+def view_type(cls: type) -> type[StructView]:
+    if (view_cls := cls.__dict__.get(VIEW_TYPE)) is None:
+        if (schema := get_schema(cls)) is None:
+            raise TypeError(f"{cls.__name__} is not a struct class")
+        view_cls = make_view_type(cls, schema)
+        setattr(cls, VIEW_TYPE, view_cls)
+    return view_cls
+
+
+def as_mapping(obj) -> StructView:
+    "return a read-only Mapping view over fields of a struct instance"
+    try:
+        view_cls = type(obj).__dict__[VIEW_TYPE]
+    except KeyError:
+        view_cls = view_type(type(obj))
+    return view_cls(obj)
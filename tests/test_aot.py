@@ -0,0 +1,80 @@
+import dataclasses
+import importlib
+import sys
+
+import pytest
+
+from baozi import aot
+
+MODELS = """
+import baozi
+
+
+class User(baozi.FrozenStruct):
+    name: str
+    age: int = 0
+"""
+
+
+@pytest.fixture
+def models_module(tmp_path, monkeypatch):
+    (tmp_path / "aot_models.py").write_text(MODELS)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "aot_models"
+    sys.modules.pop("aot_models", None)
+    aot.disable()
+
+
+def test_aot_compile_and_load(models_module):
+    written = aot.compile_modules([models_module])
+    assert len(written) == 1 and written[0].endswith(aot.CACHE_SUFFIX)
+    aot.disable()
+    assert dataclasses._create_fn is not aot.create_fn  # type: ignore
+
+    sys.modules.pop(models_module)
+    cache = aot.enable(write=False)
+    models = importlib.import_module(models_module)
+    assert cache.misses == 0 and cache.hits > 0
+
+    user = models.User(name="user")
+    assert user == models.User(name="user", age=0)
+    assert repr(user) == "User(name='user', age=0)"
+
+
+def test_aot_invalidated_on_source_change(models_module, tmp_path):
+    aot.compile_modules([models_module])
+    aot.disable()
+
+    (tmp_path / "aot_models.py").write_text(MODELS + "\n# changed\n")
+    sys.modules.pop(models_module)
+    cache = aot.enable(write=False)
+    importlib.import_module(models_module)
+    assert cache.hits == 0 and cache.misses > 0
+
+
+PLAIN = """
+import dataclasses
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int = 0
+"""
+
+
+def test_aot_skips_plain_dataclasses(models_module, tmp_path):
+    (tmp_path / "aot_plain.py").write_text(PLAIN)
+    try:
+        cache = aot.enable(write=False)
+        assert dataclasses._create_fn is not aot.create_fn  # type: ignore
+        importlib.import_module("aot_plain")
+        assert cache.misses == 0
+
+        written = cache.dump()
+        assert written == []
+        importlib.import_module(models_module)
+        assert cache.misses > 0
+        assert dataclasses._create_fn is not aot.create_fn  # type: ignore
+    finally:
+        sys.modules.pop("aot_plain", None)
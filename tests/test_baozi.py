@@ -1,3 +1,4 @@
+import typing as ty
 from dataclasses import FrozenInstanceError, asdict, field
 
 import pytest
@@ -307,3 +308,92 @@ def test_field_compare():
     assert instance1 != instance2  # Different 'age'
     instance2.age = 30
     assert instance1 == instance2  # Same 'name' and 'age', despite different 'active'
+
+
+class Blob(baozi.FrozenStruct):
+    name: str
+    data: bytes
+
+
+class Shadowing(baozi.FrozenStruct):
+    # names used by the generated rebuild function
+    _new: int
+    _cls: str
+    _set__new: bytes
+
+
+def test_pickle_reduce():
+    import copy
+    import pickle
+
+    blob = Blob(name="blob", data=b"payload" * 1024)
+    assert blob.__reduce_ex__(4)[1] == (("blob", b"payload" * 1024),)
+
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        assert pickle.loads(pickle.dumps(blob, protocol=protocol)) == blob
+
+    buffers = []
+    data = pickle.dumps(blob, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 1
+    loaded = pickle.loads(data, buffers=buffers)
+    assert loaded == blob and type(loaded.data) is bytes
+
+    assert copy.copy(blob) == blob
+    assert copy.deepcopy(blob) == blob
+
+    shadowing = Shadowing(_new=1, _cls="a", _set__new=b"b" * 2048)
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        assert pickle.loads(pickle.dumps(shadowing, protocol=protocol)) == shadowing
+
+
+def test_immutable_registry(monkeypatch):
+    import enum
+    from decimal import Decimal
+    from pathlib import Path
+    from uuid import UUID
+    from weakref import WeakKeyDictionary
+
+    from baozi import frozen
+    from baozi.frozen import is_type_immutable
+
+    # registrations below are undone after the test
+    monkeypatch.setattr(frozen, "IMMUTABLE_REGISTRY", set(frozen.IMMUTABLE_REGISTRY))
+    monkeypatch.setattr(frozen, "_MRO_CACHE", WeakKeyDictionary())
+
+    class Color(enum.Enum):
+        red = 1
+
+    class Name(str):
+        ...
+
+    class Tags(tuple):
+        ...
+
+    class SubTags(Tags):
+        ...
+
+    for type_ in (Decimal, UUID, Path, Color, Name, Tags, SubTags, ty.Optional[int]):
+        assert is_field_immutable(type_)
+
+    class Money:
+        digits: list[int]
+
+    class Euro(Money):
+        ...
+
+    with pytest.raises(baozi.InvalidTypeError):
+        is_field_immutable(Money)
+
+    baozi.register_immutable(Money)
+    assert is_type_immutable(Euro)
+
+    class Wallet(baozi.FrozenStruct):
+        balance: Euro
+        currency: Color
+
+    assert baozi.get_schema(Wallet).immutable
+
+    with pytest.raises(baozi.MutableFieldError):
+
+        class Pair(baozi.FrozenStruct):
+            point: ty.NamedTuple("Point", [("xs", list)])
@@ -0,0 +1,118 @@
+import typing as ty
+
+import pytest
+
+import baozi
+from baozi import IndexedCollection, Range
+
+
+class Person(baozi.FrozenStruct):
+    name: str
+    age: int
+    city: str = "hz"
+
+
+class Draft(baozi.Struct):
+    name: str
+
+
+class Ranked(baozi.FrozenStruct):
+    name: str
+    rank: ty.Union[int, str]
+    score: ty.Optional[int] = None
+
+
+@pytest.fixture
+def people():
+    records = [
+        Person(name="a", age=10),
+        Person(name="b", age=20, city="sh"),
+        Person(name="c", age=30),
+        Person(name="a", age=40, city="sh"),
+    ]
+    return IndexedCollection(
+        Person, hash_index=["name"], sorted_index=["age"], records=records
+    )
+
+
+def test_find(people):
+    assert [p.age for p in people.find(name="a")] == [10, 40]
+    assert [p.age for p in people.find(age=Range(20, 40))] == [20, 30]
+    assert [p.age for p in people.find(age=Range(20, 40, include_high=True))] == [20, 30, 40]
+    assert [p.age for p in people.find(age=Range(low=20, include_low=False))] == [30, 40]
+    assert [p.age for p in people.find(name="a", age=Range(high=20))] == [10]
+    assert [p.age for p in people.find(city="sh", age=Range(high=35))] == [20]
+    assert people.find_one(name="missing") is None
+    assert len(people.find()) == 4
+
+
+def test_incremental_update(people):
+    a = people.find_one(name="a", age=10)
+    updated = people.update(a, name="z", age=50)
+
+    assert a not in people and updated in people
+    assert [p.age for p in people.find(name="a")] == [40]
+    assert people.find(name="z") == [updated]
+    assert [p.age for p in people.find(age=Range(45))] == [50]
+
+    people.remove(updated)
+    assert people.find(name="z") == [] and len(people) == 3
+    with pytest.raises(KeyError):
+        people.remove(updated)
+
+
+def test_validation():
+    with pytest.raises(baozi.FieldNotFoundError):
+        IndexedCollection(Person, hash_index=["missing"])
+
+    with pytest.raises(TypeError, match="not a frozen struct"):
+        IndexedCollection(Draft, hash_index=["name"])
+    with pytest.raises(TypeError, match="may be None"):
+        IndexedCollection(Ranked, sorted_index=["score"])
+
+    coll = IndexedCollection(Person)
+    with pytest.raises(baozi.FieldNotFoundError):
+        coll.find(missing=1)
+    with pytest.raises(TypeError):
+        coll.add(Draft(name="a"))
+
+
+def test_failed_add_keeps_indexes():
+    coll = IndexedCollection(Ranked, hash_index=["name"], sorted_index=["rank"])
+    first = Ranked(name="a", rank=1)
+    coll.add(first)
+
+    with pytest.raises(TypeError):
+        coll.add(Ranked(name="a", rank="x"))
+    assert len(coll) == 1
+    assert coll.find(name="a") == [first]
+
+    with pytest.raises(TypeError):
+        coll.replace(first, Ranked(name="b", rank="x"))
+    assert list(coll) == [first]
+    assert coll.find(name="a") == [first] and coll.find(name="b") == []
+    assert coll.find(rank=Range(0, 5)) == [first]
+
+
+def test_replace_with_existing_record():
+    coll = IndexedCollection(Person, hash_index=["name"], sorted_index=["age"])
+    a, b = Person(name="a", age=1), Person(name="b", age=2)
+    coll.add(a)
+    coll.add(b)
+
+    with pytest.raises(ValueError):
+        coll.replace(a, b)
+    assert coll.find(age=Range(0, 10)) == [a, b]
+    coll.remove(b)
+    assert coll.find(age=Range(0, 10)) == [a] and coll.find(name="b") == []
+
+
+def test_range_scan_skips_none():
+    coll = IndexedCollection(Ranked, hash_index=["name"])
+    scored = Ranked(name="a", rank=1, score=3)
+    coll.add(scored)
+    coll.add(Ranked(name="b", rank=2))
+    coll.add(Ranked(name="c", rank="x", score=4))
+
+    assert coll.find(score=Range(0, 5)) == [scored, coll.find_one(name="c")]
+    assert coll.find(rank=Range(0, 5)) == [scored, coll.find_one(name="b")]
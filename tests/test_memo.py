@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+import baozi
+from baozi.memo import memoize
+
+
+class Point(baozi.FrozenStruct):
+    x: int
+    y: int
+
+
+class Cursor(baozi.Struct):
+    x: int
+
+
+def test_memoize_hits():
+    calls = []
+
+    @memoize(maxsize=2)
+    def norm(p: Point, scale: int = 1):
+        calls.append(p)
+        return (p.x + p.y) * scale
+
+    p = Point(x=1, y=2)
+    assert norm(p) == 3
+    assert norm(p) == 3
+    assert norm(Point(x=1, y=2)) == 3  # equal instance, hashed once then aliased
+    assert norm(p, scale=2) == 6
+    assert len(calls) == 2
+
+    info = norm.cache_info()
+    assert info.hits == 2 and info.misses == 2 and info.currsize == 2
+    assert info.hit_rate == 0.5
+
+    norm(Point(x=5, y=5))  # evicts least recently used
+    assert norm.cache_info().currsize == 2
+    norm(p)
+    assert len(calls) == 4
+
+    norm.cache_clear()
+    assert norm.cache_info() == (0, 0, 2, 0)
+
+
+def test_memoize_ttl():
+    calls = []
+
+    @memoize(ttl=0.01)
+    def ident(p: Point):
+        calls.append(p)
+        return p
+
+    p = Point(x=1, y=1)
+    ident(p)
+    ident(p)
+    time.sleep(0.02)
+    ident(p)
+    assert len(calls) == 2
+
+
+def test_memoize_refuse_mutable():
+    @memoize()
+    def read(c):
+        return c.x
+
+    with pytest.raises(baozi.MutableArgumentError):
+        read(Cursor(x=1))
+
+    with pytest.raises(baozi.MutableArgumentError):
+        read(c=Cursor(x=1))
@@ -0,0 +1,79 @@
+import pickle
+import random
+
+import pytest
+
+import baozi
+from baozi.order import ORDER_KEY_ATTR, sort_structs
+
+
+class Row(baozi.FrozenStruct, order=True, cache_order=True):
+    age: int
+    name: str
+
+
+class Plain(baozi.FrozenStruct):
+    age: int
+    name: str
+
+
+ROWS = [Row(age=random.randrange(10), name=f"n{i}") for i in range(200)]
+
+
+def test_sort_key():
+    key = Row.sort_key("age", "name")
+    assert key(Row(age=1, name="a")) == (1, "a")
+    assert Row.sort_key("name")(Row(age=1, name="a")) == "a"
+    assert sorted(ROWS, key=key) == sorted(ROWS, key=lambda r: (r.age, r.name))
+
+    with pytest.raises(baozi.FieldNotFoundError):
+        Row.sort_key("missing")
+
+
+def test_sort_structs():
+    expected = sorted(ROWS, key=lambda r: (-r.age, r.name))
+    assert sort_structs(ROWS, "-age", "name") == expected
+    assert sort_structs(ROWS, "age", "-name", reverse=True) == expected
+    assert sort_structs([]) == []
+
+
+def test_cached_order():
+    a, b = Row(age=1, name="b"), Row(age=2, name="a")
+    assert a < b and b > a and a <= a and b >= a
+    assert getattr(a, ORDER_KEY_ATTR) == (1, "b")
+    assert sorted(ROWS) == sorted(ROWS, key=lambda r: (r.age, r.name))
+    assert pickle.loads(pickle.dumps(a)) == a
+
+    with pytest.raises(TypeError):
+        a < Plain(age=1, name="b")
+
+
+def test_cache_order_config():
+    with pytest.raises(TypeError):
+
+        class Unordered(baozi.FrozenStruct, cache_order=True):
+            age: int
+
+    with pytest.raises(TypeError):
+
+        class Mutable(baozi.Struct, order=True, cache_order=True):
+            age: int
+
+
+class Uncompared(baozi.FrozenStruct):
+    x: int = baozi.field(compare=False)
+
+
+class Shadowed(baozi.FrozenStruct):
+    sort_key: int
+    name: str
+
+
+def test_sort_key_edge_cases():
+    items = [Uncompared(x=2), Uncompared(x=1)]
+    assert sort_structs(items) == items
+    assert baozi.make_sort_key(Uncompared)(items[0]) == ()
+
+    rows = [Shadowed(sort_key=2, name="a"), Shadowed(sort_key=1, name="b")]
+    key = baozi.make_sort_key(Shadowed, "sort_key")
+    assert sorted(rows, key=key) == rows[::-1]
@@ -0,0 +1,52 @@
+import pytest
+
+import baozi
+from baozi import Patch, apply_patch, diff
+
+
+class Address(baozi.FrozenStruct):
+    city: str
+    street: str
+
+
+class User(baozi.FrozenStruct):
+    name: str
+    age: int
+    address: Address
+
+
+class Session(baozi.Struct):
+    user: User
+    hits: int = 0
+
+
+def test_diff():
+    home = Address(city="hz", street="a")
+    user = User(name="u", age=1, address=home)
+
+    assert diff(user, user) == {}
+    assert diff(user, user.but(age=2)) == {"age": 2}
+
+    moved = user.but(address=home.but(street="b"))
+    patch = diff(user, moved)
+    assert patch == {"address": {"street": "b"}}
+    assert isinstance(patch["address"], Patch)
+    assert diff(user, moved, deep=False) == {"address": moved.address}
+
+    with pytest.raises(TypeError):
+        diff(user, home)  # type: ignore
+
+
+def test_apply_patch():
+    home = Address(city="hz", street="a")
+    user = User(name="u", age=1, address=home)
+    target = user.but(age=2, address=home.but(street="b"))
+
+    patched = apply_patch(user, diff(user, target))
+    assert patched == target and user.age == 1
+    assert user.but(**diff(user, target, deep=False)) == target
+
+    session = Session(user=user)
+    other = Session(user=target, hits=3)
+    assert apply_patch(session, diff(session, other)) is session
+    assert session == other
@@ -88,3 +88,46 @@ def test_performan_ranking():
         f"BaoziFrozenStruct: {baozistruct.result} seconds\n"
         f"PydanticModel: {pydanticbase.result} seconds\n"
     )
+
+
+class ReducePickled(FrozenStruct):
+    name: str
+    age: int
+    payload: bytes
+
+
+class StatePickled(FrozenStruct):
+    name: str
+    age: int
+    payload: bytes
+
+
+# fall back to __getstate__/__setstate__
+StatePickled.__reduce_ex__ = object.__reduce_ex__  # type: ignore
+
+
+PICKLE_TRIALS = 10**5
+
+
+def test_pickle_reduce_vs_state():
+    import pickle
+
+    reduce_objs = [
+        ReducePickled(name="a", age=i, payload=b"x" * 64) for i in range(PICKLE_TRIALS)
+    ]
+    state_objs = [
+        StatePickled(name="a", age=i, payload=b"x" * 64) for i in range(PICKLE_TRIALS)
+    ]
+
+    with timer() as reduce_timer:
+        assert pickle.loads(pickle.dumps(reduce_objs, protocol=5)) == reduce_objs
+
+    with timer() as state_timer:
+        assert pickle.loads(pickle.dumps(state_objs, protocol=5)) == state_objs
+
+    assert reduce_timer.result < state_timer.result
+
+    print(
+        f"__reduce_ex__: {reduce_timer.result} seconds\n"
+        f"__getstate__/__setstate__: {state_timer.result} seconds\n"
+    )
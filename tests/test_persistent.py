@@ -0,0 +1,63 @@
+import pytest
+
+import baozi
+from baozi import PMap, PVector, is_field_immutable
+
+
+class Inventory(baozi.FrozenStruct):
+    name: str
+    items: PVector[int]
+    prices: PMap[str, float]
+
+
+def test_pvector():
+    vec = PVector(range(2000))
+    updated = vec.set(1500, -1).append(2000)
+
+    assert len(vec) == 2000 and len(updated) == 2001
+    assert vec[1500] == 1500 and updated[1500] == -1
+    assert updated[-1] == 2000
+    assert list(updated[1499:1502]) == [1499, -1, 1501]
+    assert PVector(range(2000)) == vec and hash(PVector(range(2000))) == hash(vec)
+
+    with pytest.raises(IndexError):
+        vec[2000]
+
+
+def test_pvector_structural_sharing():
+    vec = PVector(range(100_000))
+    updated = vec.set(0, -1)
+    # only the path to index 0 is copied
+    assert vec._root[1] is updated._root[1]
+
+
+def test_pmap():
+    pmap = PMap({"a": 1, "b": 2})
+    updated = pmap.set("c", 3).delete("a")
+
+    assert dict(pmap.items()) == {"a": 1, "b": 2}
+    assert dict(updated.items()) == {"b": 2, "c": 3}
+    assert "a" not in updated and updated.get("a") is None
+    assert pmap == {"a": 1, "b": 2}
+    assert hash(pmap) == hash(PMap({"b": 2, "a": 1}))
+
+    with pytest.raises(KeyError):
+        updated.delete("a")
+
+
+def test_persistent_field_immutable():
+    assert is_field_immutable(PVector[int])
+    assert is_field_immutable(PMap[str, tuple[int, ...]])
+    assert not is_field_immutable(PMap[str, list[int]])
+
+
+def test_persistent_field_but():
+    inv = Inventory(
+        name="inv", items=PVector(range(100_000)), prices=PMap({"apple": 1.0})
+    )
+    updated = inv.but(items=inv.items.set(5, -5), prices=inv.prices.set("pear", 2.0))
+
+    assert updated.items[5] == -5 and inv.items[5] == 5
+    assert updated.items._root[-1] is inv.items._root[-1]
+    assert updated.prices["pear"] == 2.0 and "pear" not in inv.prices
+    assert updated.name == "inv"
@@ -0,0 +1,55 @@
+from dataclasses import field
+
+import pytest
+
+import baozi
+from baozi.pool import StructPool
+
+
+class Scratch(baozi.Struct):
+    topic: str
+    size: int = 0
+    parts: list[str] = field(default_factory=list)
+
+
+def test_pool_reuse():
+    pool = StructPool(Scratch, maxsize=1)
+    first = pool.acquire(topic="a", size=3)
+    first.parts.append("x")
+    pool.release(first)
+    assert pool.size == 1
+
+    second = pool.acquire(topic="b")
+    assert second is first
+    assert second.topic == "b" and second.size == 0 and second.parts == []
+
+    third = pool.acquire(topic="c")
+    assert third is not second
+    pool.release(second)
+    pool.release(third)
+    assert pool.size == 1
+
+
+def test_pool_borrow():
+    pool = StructPool(Scratch, debug=True)
+    with pool.borrow(topic="a") as scratch:
+        assert pool.outstanding == 1
+        assert scratch == Scratch(topic="a")
+    assert pool.outstanding == 0 and pool.size == 1
+
+    with pytest.raises(ValueError):
+        pool.release(scratch)
+
+    with pytest.raises(TypeError):
+        pool.acquire(size=1)
+
+
+def test_pool_refuse_frozen():
+    class Frozen(baozi.FrozenStruct):
+        topic: str
+
+    with pytest.raises(TypeError):
+        StructPool(Frozen)
+
+    with pytest.raises(TypeError):
+        StructPool(Scratch).release(Frozen(topic="a"))  # type: ignore
@@ -0,0 +1,90 @@
+import enum
+import typing as ty
+from dataclasses import MISSING, field
+
+import pytest
+
+import baozi
+from baozi.schema import get_schema, resolve_schema
+
+
+class Profile(baozi.FrozenStruct):
+    version: ty.ClassVar[str] = "1"
+
+    name: str
+    age: int = 15
+    tags: tuple[str, ...] = field(default_factory=tuple)
+
+
+class Draft(baozi.Struct):
+    title: str
+    pages: list[int]
+
+
+class Paint(baozi.Struct):
+    layers: int
+    color: "Color"
+
+
+class Color(str, enum.Enum):
+    red = "red"
+
+
+def test_schema_fields():
+    schema = get_schema(Profile)
+    assert schema.field_names == ("name", "age", "tags")
+    assert schema.types["tags"] == tuple[str, ...]
+    assert schema.defaults == {"age": 15}
+    assert schema.offsets == {"name": 0, "age": 1, "tags": 2}
+    assert schema.converters["age"] is int
+
+    name, age, tags = schema.fields
+    assert name.required and not age.required and not tags.required
+    assert tags.default is MISSING and tags.default_factory is tuple
+
+
+def test_schema_immutability():
+    assert get_schema(Profile).immutable
+    assert get_schema(Profile).frozen
+    assert not get_schema(Draft).immutable
+    assert not get_schema(Draft).frozen
+
+
+def test_schema_not_inherited():
+    class Child(Profile):
+        address: str
+
+    assert get_schema(Child).field_names == ("name", "age", "tags", "address")
+    assert get_schema(Profile).field_names == ("name", "age", "tags")
+    assert get_schema(Child(name="n", address="a")) is get_schema(Child)
+    assert get_schema(int) is None
+
+
+def test_schema_readonly():
+    schema = get_schema(Profile)
+    try:
+        schema.types["name"] = int  # type: ignore
+    except TypeError:
+        pass
+    else:
+        raise Exception("Should not reach here")
+
+
+def test_schema_forward_ref():
+    # Color is defined after Paint, other fields are resolved at class creation
+    assert get_schema(Paint).types["layers"] is int
+    assert get_schema(Paint).types["color"] == "Color"
+
+    assert baozi.parse_config(Paint, {"layers": "1", "color": "red"}) == {
+        "layers": 1,
+        "color": Color.red,
+    }
+    assert get_schema(Paint).types["color"] is Color
+    assert resolve_schema(Paint) is get_schema(Paint)
+
+
+def test_frozen_undefined_forward_ref():
+    with pytest.raises(NameError, match="'Missing' is not defined"):
+
+        class Broken(baozi.FrozenStruct):
+            part: "Missing"  # type: ignore  # noqa: F821
@@ -0,0 +1,101 @@
+import json
+import os
+
+import pytest
+
+import baozi
+from baozi.snapshot import load_config, snapshot_path
+
+
+class Database(baozi.ConfigBase):
+    host: str
+    port: int
+
+
+class AppConfig(baozi.ConfigBase):
+    name: str
+    debug: bool
+    db: Database
+
+
+class TextDatabase(baozi.ConfigBase):
+    host: str
+    port: str
+
+
+class OtherConfig(baozi.ConfigBase):
+    name: str
+    debug: bool
+    db: TextDatabase
+
+
+SOURCE = dict(name="app", debug=True, db=dict(host="localhost", port="5432"))
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps(SOURCE))
+    return path
+
+
+def test_nested_parse():
+    config = AppConfig.parse(SOURCE)
+    assert config.db == Database(host="localhost", port=5432)
+
+
+def test_snapshot_roundtrip(source, monkeypatch):
+    config = AppConfig.load(source)
+    assert config == AppConfig.parse(SOURCE)
+    assert os.path.exists(snapshot_path(AppConfig, source))
+
+    def fail(cls, values):
+        raise AssertionError("parsed again")
+
+    monkeypatch.setattr(baozi.baozi, "parse_config", fail)
+    cached = AppConfig.load(source)
+    assert cached == config
+    assert type(cached.db) is Database
+
+
+def test_snapshot_invalidation(source):
+    path = snapshot_path(AppConfig, source)
+    AppConfig.load(source)
+    first = os.path.getmtime(path)
+
+    source.write_text(json.dumps(SOURCE | dict(name="changed")))
+    assert AppConfig.load(source).name == "changed"
+
+    with open(path, "wb") as file:
+        file.write(b"garbage")
+    assert AppConfig.load(source).name == "changed"
+    assert os.path.getsize(path) > 7
+    assert os.path.getmtime(path) >= first
+
+
+def test_schema_change(source):
+    snapshot = source.parent / "shared.snapshot"
+    AppConfig.load(source, snapshot=snapshot)
+    assert baozi.schema_fingerprint(AppConfig) != baozi.schema_fingerprint(OtherConfig)
+    other = OtherConfig.load(source, snapshot=snapshot)
+    assert type(other) is OtherConfig and other.db.port == "5432"
+
+
+def test_loader(tmp_path):
+    source = tmp_path / "settings.conf"
+    source.write_text("ignored")
+    with pytest.raises(ValueError):
+        AppConfig.load(source)
+
+    config = load_config(AppConfig, source, loader=lambda data: SOURCE)
+    assert config.name == "app"
+
+
+def test_unloadable_snapshot(source, monkeypatch):
+    AppConfig.load(source)
+
+    def moved(data):
+        raise ModuleNotFoundError("config classes moved")
+
+    monkeypatch.setattr("baozi.snapshot.pickle.loads", moved)
+    assert AppConfig.load(source) == AppConfig.parse(SOURCE)
@@ -0,0 +1,100 @@
+import io
+import json
+import typing as ty
+
+import pytest
+
+import baozi
+from baozi.stream import iter_csv, iter_ndjson
+
+
+class Record(baozi.FrozenStruct):
+    name: str
+    age: int
+    active: bool = True
+
+
+class Scored(baozi.FrozenStruct):
+    name: str
+    score: ty.Optional[int] = None
+    ranks: tuple[int, ...] = ()
+    level: int = 1
+
+
+ROWS = [{"name": f"n{i}", "age": i} for i in range(100)]
+
+
+@pytest.fixture
+def ndjson_path(tmp_path):
+    path = tmp_path / "records.ndjson"
+    path.write_text("\n".join(json.dumps(row) for row in ROWS) + "\n")
+    return path
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "records.csv"
+    lines = ["age,name,active"] + [f"{r['age']},{r['name']},false" for r in ROWS]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_iter_ndjson(ndjson_path):
+    records = list(iter_ndjson(Record, ndjson_path))
+    assert records == [Record(**row) for row in ROWS]
+    assert list(iter_ndjson(Record, ndjson_path, use_mmap=True)) == records
+
+    chunks = list(iter_ndjson(Record, ndjson_path, chunk_size=30))
+    assert [len(chunk) for chunk in chunks] == [30, 30, 30, 10]
+
+    text = io.StringIO('{"name": "a", "age": "5"}\n\n')
+    assert list(iter_ndjson(Record, text)) == [Record(name="a", age=5)]
+
+
+def test_iter_csv(csv_path):
+    records = list(iter_csv(Record, csv_path, use_mmap=True))
+    assert records == [Record(active=False, **row) for row in ROWS]
+
+    text = io.StringIO("name;age\na;5\n")
+    assert list(iter_csv(Record, text, delimiter=";")) == [Record(name="a", age=5)]
+
+
+def test_typing_fields():
+    text = io.StringIO("name,score,level\na,7,\nb,,3\nc\n")
+    assert list(iter_csv(Scored, text)) == [
+        Scored(name="a", score=7),
+        Scored(name="b", level=3),
+        Scored(name="c"),
+    ]
+
+    text = io.StringIO('{"name": "a", "score": "7", "ranks": ["1", 2]}\n')
+    assert list(iter_ndjson(Scored, text)) == [Scored(name="a", score=7, ranks=(1, 2))]
+
+    with pytest.raises(baozi.TypeCoerceError):
+        list(iter_csv(Scored, io.StringIO("name,score\na,seven\n")))
+    with pytest.raises(baozi.TypeCoerceError):
+        list(iter_ndjson(Scored, io.StringIO('{"name": "a", "ranks": "12"}')))
+
+
+def test_stream_errors():
+    with pytest.raises(baozi.ValueNotFoundError):
+        list(iter_ndjson(Record, io.StringIO('{"age": 5}')))
+
+    with pytest.raises(baozi.TypeCoerceError):
+        list(iter_csv(Record, io.StringIO("name,age\na,five\n")))
+
+    with pytest.raises(baozi.ValueNotFoundError):
+        list(iter_csv(Record, io.StringIO("name,age\na\n")))
+    with pytest.raises(baozi.ValueNotFoundError):
+        list(iter_csv(Record, io.StringIO("name,age\n,5\n")))
+
+    with pytest.raises(TypeError):
+        iter_ndjson(Record, io.StringIO(""), workers=2)
+
+
+def test_parallel(ndjson_path, csv_path):
+    expected = [Record(**row) for row in ROWS]
+    assert list(iter_ndjson(Record, ndjson_path, workers=2, block_size=100)) == expected
+
+    records = list(iter_csv(Record, csv_path, workers=2, block_size=100))
+    assert records == [Record(active=False, **row) for row in ROWS]
@@ -0,0 +1,87 @@
+import multiprocessing
+
+import pytest
+
+import baozi
+from baozi import StructTable, write_table
+
+
+class City(baozi.FrozenStruct):
+    name: str
+    population: int
+    area: float
+    capital: bool
+    code: bytes = b""
+
+
+class Town(baozi.FrozenStruct):
+    name: str
+    population: int
+
+
+class Tagged(baozi.FrozenStruct):
+    tags: tuple[str, ...]
+
+
+CITIES = [
+    City(name="Tokyo", population=14_000_000, area=2194.1, capital=True, code=b"TYO"),
+    City(name="Osaka", population=2_700_000, area=225.2, capital=False),
+    City(name="東京", population=0, area=0.0, capital=False, code=b"TYO"),
+]
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "cities.tbl"
+    assert write_table(path, City, CITIES) == 3
+    return path
+
+
+def test_table_rows(path):
+    with StructTable(path, City) as table:
+        assert len(table) == 3
+        assert list(table) == CITIES
+        assert table[0] == CITIES[0] and table[-1] == CITIES[-1]
+        assert table[1:] == CITIES[1:]
+        assert type(table[0]) is City and hash(table[0]) == hash(CITIES[0])
+
+        with pytest.raises(IndexError):
+            table[3]
+
+
+def test_table_view(path):
+    with StructTable(path, City) as table:
+        view = table.view(2)
+        assert view.name == "東京" and view.code == b"TYO"
+        assert view.area == 0.0 and view.capital is False
+        assert table.view(0).population == 14_000_000
+
+        with pytest.raises(AttributeError):
+            view.name = "other"
+
+
+def test_table_layout_mismatch(path, tmp_path):
+    with pytest.raises(ValueError):
+        StructTable(path, Town)
+
+    garbage = tmp_path / "garbage.tbl"
+    garbage.write_bytes(b"not a table")
+    with pytest.raises(ValueError):
+        StructTable(garbage, City)
+
+
+def test_unsupported_field(tmp_path):
+    with pytest.raises(baozi.UnsupportedFieldTypeError):
+        write_table(tmp_path / "tagged.tbl", Tagged, [])
+
+
+def _read_names(path) -> list[str]:
+    with StructTable(path, City) as table:
+        return [city.name for city in table]
+
+
+def test_table_shared(path):
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(2) as pool:
+        results = pool.map(_read_names, [path, path])
+    assert results == [[city.name for city in CITIES]] * 2
@@ -0,0 +1,93 @@
+import pickle
+import typing as ty
+
+import pytest
+
+import baozi
+from baozi import freeze, thaw
+
+
+class Item(baozi.Struct, twin=True):
+    name: str
+    tags: list[str] = baozi.field(default_factory=list)
+
+
+class Order(baozi.Struct, twin=True):
+    id: int
+    items: list[Item]
+    meta: dict[str, int]
+    labels: set[str]
+    note: ty.Optional[list[int]] = None
+
+
+class Point(baozi.FrozenStruct, twin=True, order=True):
+    coords: tuple[int, ...]
+    names: frozenset[str] = frozenset()
+
+
+def make_order() -> Order:
+    items = [Item(name="a", tags=["x", "y"]), Item(name="b")]
+    return Order(id=1, items=items, meta={"a": 1}, labels={"q"}, note=[3])
+
+
+def test_frozen_twin_types():
+    frozen = Order.Frozen
+    assert frozen.Mutable is Order
+    assert baozi.get_schema(frozen).immutable
+    assert frozen.__annotations__["items"] == tuple[Item.Frozen, ...]
+    assert frozen.__annotations__["meta"] == baozi.PMap[str, int]
+    assert frozen.__annotations__["labels"] == frozenset[str]
+    assert frozen.__annotations__["note"] == ty.Optional[tuple[int, ...]]
+
+
+def test_freeze_thaw():
+    order = make_order()
+    frozen = freeze(order)
+    assert type(frozen) is Order.Frozen
+    assert frozen.items == (Item.Frozen(name="a", tags=("x", "y")), Item.Frozen(name="b"))
+    assert frozen.meta == baozi.PMap({"a": 1})
+    assert frozen.labels == frozenset({"q"})
+    assert frozen.note == (3,)
+    assert hash(frozen) == hash(freeze(make_order()))
+    assert freeze(frozen) is frozen
+
+    thawed = thaw(frozen)
+    assert type(thawed) is Order
+    assert thawed == order
+    assert type(thawed.meta) is dict and type(thawed.items[0].tags) is list
+    assert thaw(thawed) is thawed
+
+
+def test_twin_defaults():
+    assert Item.Frozen(name="a").tags == ()
+    assert Point.Mutable(coords=[1]).names == set()
+    assert Point.Mutable(coords=[1]).names is not Point.Mutable(coords=[2]).names
+
+
+def test_mutable_twin():
+    point = Point(coords=(1, 2), names=frozenset({"a"}))
+    mutable = thaw(point)
+    assert type(mutable) is Point.Mutable
+    assert mutable.coords == [1, 2] and mutable.names == {"a"}
+    mutable.coords.append(3)
+    assert freeze(mutable) == Point(coords=(1, 2, 3), names=frozenset({"a"}))
+    assert Point(coords=(1,)) < Point(coords=(2,))
+    assert thaw(Point(coords=(1,))) < thaw(Point(coords=(2,)))
+
+
+def test_twin_pickle():
+    frozen = freeze(make_order())
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+
+def test_no_twin():
+    class Plain(baozi.Struct):
+        name: str
+
+    class FrozenPlain(baozi.FrozenStruct):
+        name: str
+
+    with pytest.raises(TypeError):
+        freeze(Plain(name="a"))
+    with pytest.raises(TypeError):
+        thaw(FrozenPlain(name="a"))
@@ -0,0 +1,64 @@
+from collections.abc import Mapping
+
+import pytest
+
+import baozi
+from baozi import as_mapping
+
+
+class Account(baozi.FrozenStruct):
+    name: str
+    balance: int = 0
+
+
+class Draft(baozi.Struct):
+    title: str
+
+
+class AccountConfig(baozi.ConfigBase):
+    name: str
+    balance: int
+
+
+def test_view_mapping():
+    acc = Account(name="acc", balance=5)
+    view = as_mapping(acc)
+
+    assert isinstance(view, Mapping)
+    assert dict(view) == {"name": "acc", "balance": 5}
+    assert list(view.items()) == [("name", "acc"), ("balance", 5)]
+    assert list(view.values()) == ["acc", 5]
+    assert len(view) == 2 and "name" in view and "_hidden" not in view
+    assert view == {"name": "acc", "balance": 5}
+    assert type(view) is type(as_mapping(Account(name="other")))
+
+    with pytest.raises(KeyError):
+        view["missing"]
+
+
+def test_view_is_live():
+    draft = Draft(title="a")
+    view = as_mapping(draft)
+    draft.title = "b"
+    assert view["title"] == "b"
+
+
+def test_view_handoff():
+    acc = Account(name="acc", balance=5)
+    assert AccountConfig.parse(acc) == AccountConfig(name="acc", balance=5)
+
+
+class Secret(baozi.ConfigBase):
+    name: str
+    _token: str = "hidden"
+
+
+def test_read_helpers_unchanged():
+    secret = Secret(name="a")
+    assert baozi.read_slots(secret) == {"name": "a"}
+    assert "_token" not in repr(secret)
+
+    draft = Draft(title="a")
+    draft.extra = 1
+    attrs = baozi.read_attributes(draft)
+    assert type(attrs) is dict and attrs == {"title": "a", "extra": 1}